@@ -1,66 +1,139 @@
 # config.py
+import json
+import os
 
-# Dictionary to map location names to their AccuWeather location keys and Twitter handles
-resorts = {
-    "Brighton": {
-        "accuweather_key": "1-28182_1_poi_al",   # Brighton Ski Resort, Utah
-        "twitter_handle": "brightonresort",
-        "location": "Brighton,UT",
-        "resort_slug": "brighton",
-        "roadcam_webpage_url": "http://cottonwoodcanyons.udot.utah.gov/canyon-road-information/",
-        "roadcam_img_src_urls": [
-            "http://www.udottraffic.utah.gov/AnimatedGifs/100033.gif",
-            "http://udottraffic.utah.gov/1_devices/aux14605.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux16212.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux16213.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux16215.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux16216.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux18040.jpeg",
-            "http://udottraffic.utah.gov/1_devices/SR-190%20MP%2015%2095%20SL.gif",
-        ],
-        "twitter_api_user_id": "18431196"
-    },
-    "Snowbird": {
-        "accuweather_key": "101347_poi",         # Snowbird Ski Resort, Utah
-        "twitter_handle": "snowbird",
-        "location": "Snowbird,UT",
-        "resort_slug": "snowbird",
-        "roadcam_webpage_url": "http://cottonwoodcanyons.udot.utah.gov/canyon-road-information/",
-        "roadcam_img_src_urls": [
-            "http://www.udottraffic.utah.gov/AnimatedGifs/100032.gif",
-            "http://udottraffic.utah.gov/1_devices/aux14604.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux16265.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux16267.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux16269.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux16270.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux17227.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux17226.jpeg"
-        ],
-        "twitter_api_user_id": "24749103"
-    },
-    "Snowbasin": {
-        "accuweather_key": "101346_poi",         # Snowbasin Ski Resort, Utah
-        "twitter_handle": "snowbasinresort",
-        "location": "Snowbasin,UT",
-        "resort_slug": "snowbasin",
-        "roadcam_webpage_url": "http://udottraffic.utah.gov/",
-        "roadcam_img_src_urls": [
-            "http://udottraffic.utah.gov/1_devices/RWIS%20SR-167%20TrappersLoop.gif",
-            "http://udottraffic.utah.gov/1_devices/SR-226-all.gif",
-            "http://udottraffic.utah.gov/1_devices/I-84-mp-92.jpeg",
-            "http://udottraffic.utah.gov/1_devices/aux17617.jpeg"
-        ],
-        "twitter_api_user_id": "42325818"
-    },
-    "Nordic Valley": {
-        "accuweather_key": "28217_poi",
-        "twitter_handle": "nordicvalleyski",
-        "location": "Nordic Valley, UT",
-        "resort_slug":"",
-        "roadcam_webpage_url": "",
-        "roadcam_img_src_urls": [
-
-        ],
-        "twitter_api_user_id": "2446076226"
-    }
+# Resort catalog, one entry per resort in resorts.json (or RESORT_CONDITIONS_RESORTS_FILE): the
+# AccuWeather location key, Twitter handle, region, coordinates, roadcams and so on. Loaded into a
+# dict keyed by resort name, in file order; app/utils/registry.py adds lookup by slug, region and search.
+RESORTS_FILE = os.getenv("RESORT_CONDITIONS_RESORTS_FILE", os.path.join(os.path.dirname(__file__), "resorts.json"))
+with open(RESORTS_FILE, encoding="utf-8") as f:
+    resorts = {resort.pop("name"): resort for resort in json.load(f)}
+
+
+# Number of worker threads used to run blocking API calls off the UI thread
+FETCH_WORKERS = 8
+
+# Keep-alive connection pool sizes per upstream host (hosts not listed use the default)
+HTTP_POOL_MAXSIZE_DEFAULT = 4
+HTTP_POOL_MAXSIZE = {
+    "dataservice.accuweather.com": 8,   # Four AccuWeather calls per resort visit
+    "udottraffic.utah.gov": 8,          # Roadcam images are fetched in parallel
+    "www.udottraffic.utah.gov": 2,
+}
+
+# Seconds to wait on an upstream before giving up (connect, read)
+HTTP_TIMEOUT = (5, 20)
+
+# Response cache lifetimes in seconds per endpoint: (fresh for, then served stale while refreshing for)
+CACHE_TTLS = {
+    "traffic": (5 * 60, 10 * 60),
+    "travel_times": (5 * 60, 10 * 60),
+    "current": (15 * 60, 45 * 60),
+    "historical": (60 * 60, 3 * 60 * 60),
+    "daily": (3 * 60 * 60, 9 * 60 * 60),
+    "hourly": (30 * 60, 90 * 60),
+    "resort": (30 * 60, 2 * 60 * 60),
+    "tweets": (5 * 60, 30 * 60),
+}
+
+# Maximum number of responses kept in memory before least recently used ones are evicted
+CACHE_MAX_ENTRIES = 256
+
+# Directory for files the app keeps between launches (override with RESORT_CONDITIONS_DATA_DIR)
+DATA_DIR = os.getenv("RESORT_CONDITIONS_DATA_DIR", os.path.join(os.path.expanduser("~"), ".resort-conditions"))
+
+# Seconds before the user's IP-based location is looked up again
+LOCATION_TTL = 30 * 60
+
+# Roadcam images downloaded at the same time
+ROADCAM_WORKERS = 8
+
+# Roadcam images are decoded off the UI thread and downscaled to fit this size (pixels)
+ROADCAM_MAX_SIZE = (800, 600)
+# Animated GIFs keep at most this many frames, shown no faster than ROADCAM_MIN_FRAME_DELAY seconds apart
+ROADCAM_MAX_GIF_FRAMES = 12
+ROADCAM_MIN_FRAME_DELAY = 0.2
+# Cameras whose last download and decode are kept for conditional GETs and reuse; least recently
+# used ones beyond this are dropped (enough for the cameras of MAX_LIVE_RESORT_SCREENS screens)
+ROADCAM_CACHE_MAX_CAMERAS = 24
+
+# Resort screens kept alive at once; the least recently visited one is freed beyond this
+MAX_LIVE_RESORT_SCREENS = 3
+
+# Main menu background videos, best quality first; missing files are skipped
+MENU_VIDEO_SOURCES = [
+    "app/videos/video_of_snowfall (1080p).mp4",
+    "app/videos/video_of_snowfall (720p).mp4",
+    "app/videos/video_of_snowfall (480p).mp4",
+]
+# Step down to the next video (and finally a still frame) when frames take longer than this
+MENU_FRAME_TIME_BUDGET_MS = 50
+# Frame rate cap while the menu shows a still background and nothing else animates
+MENU_IDLE_MAX_FPS = 15
+
+# Background prefetch while the Main Menu is idle
+PREFETCH_IDLE_DELAY = 3               # Seconds on the menu before prefetching starts
+PREFETCH_MIN_INTERVAL = 15 * 60       # Never re-warm the same resort more often than this
+PREFETCH_MAX_RESORTS_PER_HOUR = 8     # Cap on resorts warmed per hour
+PREFETCH_BUDGET_SHARE = 0.2           # Prefetch stops calling an API once this share of its daily budget is used
+PREFETCH_HOVER_BOOST = 5              # Priority added when a resort button is hovered
+PREFETCH_PRESS_BOOST = 20             # Priority added when a resort button is pressed
+
+# Request limits per upstream API and key: a token bucket (requests per second, burst) plus a
+# daily budget persisted across restarts. Match these to the plans your keys are on.
+API_LIMITS = {
+    "accuweather": {"per_second": 2, "burst": 8, "daily": 50},
+    "bing": {"per_second": 5, "burst": 10, "daily": 500},
+    "rapidapi_ski": {"per_second": 1, "burst": 4, "daily": 100},
+    "rapidapi_twitter": {"per_second": 1, "burst": 4, "daily": 100},
+}
+# Environment variable holding each API's key, for looking up its budget outside a request
+API_KEY_ENV = {
+    "accuweather": "ACCUWEATHER_API_KEY",
+    "bing": "BING_MAPS_API_KEY",
+    "rapidapi_ski": "X_RAPID_API_KEY",
+    "rapidapi_twitter": "X_RAPID_API_KEY",
 }
+# Share of each daily budget held back for user-visible requests; low priority work stops here
+LOW_PRIORITY_RESERVE = 0.3
+# Endpoints that are always low priority (nice to have, not what the user opened the screen for)
+LOW_PRIORITY_ENDPOINTS = {"historical", "tweets"}
+
+# Base URL of each upstream API; override with environment variables to point at another deployment
+API_BASE_URLS = {
+    "bing": os.getenv("BING_MAPS_BASE_URL", "http://dev.virtualearth.net"),
+    "accuweather": os.getenv("ACCUWEATHER_BASE_URL", "http://dataservice.accuweather.com"),
+    "rapidapi_ski": os.getenv("RAPIDAPI_SKI_BASE_URL", "https://ski-resorts-and-conditions.p.rapidapi.com"),
+    "rapidapi_twitter": os.getenv("RAPIDAPI_TWITTER_BASE_URL", "https://twitter135.p.rapidapi.com"),
+}
+
+# When set (e.g. http://127.0.0.1:8765), every request, roadcam images included, is sent to this
+# server as <override>/<original host><original path> instead; see tools/replay_server.py
+UPSTREAM_OVERRIDE_URL = os.getenv("RESORT_CONDITIONS_UPSTREAM", "")
+
+# Retries for failed connections and 502/503/504 responses, with exponential backoff
+HTTP_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.3
+
+# Per-endpoint request metrics are written here in Prometheus text format every METRICS_EXPORT_INTERVAL seconds
+METRICS_EXPORT_PATH = os.getenv("RESORT_CONDITIONS_METRICS_FILE", os.path.join(DATA_DIR, "metrics.prom"))
+METRICS_EXPORT_INTERVAL = 30
+
+# Past conditions are kept locally (app/utils/timeseries.py) for this long. The API is only asked
+# for newer hours once the newest stored observation is HISTORY_REFRESH_AFTER seconds old.
+HISTORY_RETENTION_DAYS = 180
+HISTORY_REFRESH_AFTER = 60 * 60
+
+# Travel times to every resort are cached per origin cell of this many degrees (about 1 km)
+TRAVEL_TIME_CELL_DEGREES = 0.01
+
+# Tweets are kept locally (app/utils/tweet_store.py), up to this many per handle; each poll asks
+# only for tweets newer than the newest one stored, at most TWEET_FETCH_COUNT of them
+TWEET_STORE_MAX_PER_HANDLE = 200
+TWEET_FETCH_COUNT = 10
+
+# The comparison screen fetches its resorts with at most COMPARE_WORKERS calls in flight, so a long
+# list doesn't starve the resort screens, and compares at most COMPARE_MAX_RESORTS resorts at once.
+# Its calls are low priority, so they never spend the LOW_PRIORITY_RESERVE share of a daily budget.
+COMPARE_WORKERS = 4
+COMPARE_MAX_RESORTS = 25
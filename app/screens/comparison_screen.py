@@ -0,0 +1,213 @@
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivy.properties import StringProperty
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+
+from app.config.config import COMPARE_MAX_RESORTS, resorts
+from app.screens.main_menu_screen import load_travel_times
+from app.utils import api, formatting, tasks
+from app.utils.ratelimit import rate_limiter
+from app.widgets.label import CustomLabel
+
+# (row key, heading, share of the table width)
+COLUMNS = (
+    ('resort', 'Resort', 0.25),
+    ('drive_minutes', 'Drive', 0.12),
+    ('temperature', 'Temp', 0.11),
+    ('condition', 'Conditions', 0.26),
+    ('base', 'Base', 0.12),
+    ('lifts_open', 'Lifts Open', 0.14),
+)
+
+
+def fetch_low_priority(func, *args):
+    # Runs on the fan-out pool. A comparison can call an API once per resort, so it is kept out of
+    # the share of each daily budget held back for the resort screens.
+    with rate_limiter.low_priority():
+        return func(*args)
+
+
+class ComparisonRow(BoxLayout):
+    # One table row. The RecycleView reuses rows as the table scrolls, setting these cell texts
+    # from the row's data.
+    resort = StringProperty('')
+    drive_minutes = StringProperty('')
+    temperature = StringProperty('')
+    condition = StringProperty('')
+    base = StringProperty('')
+    lifts_open = StringProperty('')
+
+    def __init__(self, **kwargs):
+        super().__init__(orientation='horizontal', **kwargs)
+        for column, _, width in COLUMNS:
+            cell = Label(font_size='18sp', size_hint_x=width, shorten=True, shorten_from='right')
+            cell.bind(size=cell.setter('text_size'))
+            cell.halign = 'center'
+            cell.valign = 'middle'
+            self.bind(**{column: cell.setter('text')})
+            self.add_widget(cell)
+
+
+class ComparisonScreen(BoxLayout):
+    # Key numbers for many resorts side by side. Every resort's calls go out at once through the
+    # same cached fetchers the resort screens use (so nothing already fetched is fetched again),
+    # on the small fan-out pool, and each cell fills in as its call returns.
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.resort_names = []
+        self.rows = {}  # Resort name -> {column: value}; a column missing from a row is still loading
+        self.sort_column = 'drive_minutes'
+        self.sort_descending = False
+        self.generation = 0  # Bumped by every load() so results from an earlier one are dropped
+        self._trigger_refresh_table = Clock.create_trigger(self.refresh_table)
+
+        self.init_ui()
+
+    def init_ui(self):
+        title_label = CustomLabel(
+            text="[color=#808080][b]Compare Resorts[/b][/color]",
+            halign='center',
+            markup=True,
+            font_name='DrippyFont',
+            font_size='60sp',
+            size_hint=(1, None),
+            height='65dp',
+        )
+        self.add_widget(title_label)
+
+        self.status_label = Label(font_size='16sp', color=(0.5, 0.5, 0.5, 1), size_hint=(1, None), height='24dp')
+        self.add_widget(self.status_label)
+
+        # Column headings; pressing one sorts by it, pressing it again reverses the order
+        header = BoxLayout(orientation='horizontal', size_hint=(1, None), height='44dp')
+        self.header_buttons = {}
+        for column, heading, width in COLUMNS:
+            button = Button(text=heading, size_hint_x=width, font_size='18sp', bold=True, background_color=(0.3, 0.3, 0.3, 1))
+            button.bind(on_release=lambda button, column=column: self.sort_by(column))
+            self.header_buttons[column] = button
+            header.add_widget(button)
+        self.add_widget(header)
+
+        # Only the rows on screen exist as widgets, however many resorts are compared
+        self.table = RecycleView(bar_width='6dp', scroll_type=['bars', 'content'])
+        table_layout = RecycleBoxLayout(orientation='vertical', default_size=(None, dp(44)), default_size_hint=(1, None),
+                                        size_hint_y=None)
+        table_layout.bind(minimum_height=table_layout.setter('height'))
+        self.table.add_widget(table_layout)
+        self.table.viewclass = ComparisonRow  # Only takes effect once the layout manager is added
+        self.add_widget(self.table)
+
+        bottom_layout = BoxLayout(orientation='horizontal', size_hint=(1, None), height='70dp', padding='5dp')
+        back_button = Button(
+            text="[color=#808080][b]Back to Menu[/b][/color]",
+            background_color=(0.3, 0.3, 0.3, 1),
+            color=(1, 1, 1, 1),
+            font_size='39sp',
+            font_name='DrippyFont',
+            markup=True
+        )
+        back_button.bind(on_release=self.switch_to_main_menu)
+        bottom_layout.add_widget(back_button)
+
+        refresh_button = Button(
+            text="[color=#808080][b]Refresh[/b][/color]",
+            background_color=(0.3, 0.3, 0.3, 1),
+            color=(1, 1, 1, 1),
+            font_size='39sp',
+            font_name='DrippyFont',
+            markup=True,
+            size_hint_x=0.4
+        )
+        refresh_button.bind(on_release=lambda button: self.load(self.resort_names))
+        bottom_layout.add_widget(refresh_button)
+        self.add_widget(bottom_layout)
+
+    def load(self, resort_names):
+        # (Re)fetch every column for resort_names. Values already shown stay until replaced.
+        self.generation += 1
+        generation = self.generation
+        self.resort_names = list(resort_names)[:COMPARE_MAX_RESORTS]
+        self.rows = {name: self.rows.get(name, {'resort': name}) for name in self.resort_names}
+        if len(resort_names) > COMPARE_MAX_RESORTS:
+            self.status_label.text = f"Comparing the first {COMPARE_MAX_RESORTS} of {len(resort_names)} resorts; narrow the search to compare others"
+        else:
+            self.status_label.text = f"Comparing {len(self.resort_names)} resorts"
+
+        # Drive times for every resort come from one matrix call
+        tasks.run_in_background(fetch_low_priority, lambda travel_times: self.show_travel_times(generation, travel_times),
+                                load_travel_times,
+                                on_error=lambda e: self.show_cells_error(generation, self.resort_names, ('drive_minutes',), e),
+                                executor=tasks.fanout_executor)
+        for name in self.resort_names:
+            resort_data = resorts[name]
+            self.load_cells(generation, name, ('temperature', 'condition'), self.weather_cells,
+                            api.fetch_weather_data, resort_data["accuweather_key"])
+            self.load_cells(generation, name, ('base', 'lifts_open'), self.lift_status_cells,
+                            api.fetch_resort_data, resort_data["resort_slug"])
+        self.refresh_table()
+
+    def load_cells(self, generation, name, columns, to_cells, func, *args):
+        tasks.run_in_background(fetch_low_priority, lambda record: self.show_cells(generation, name, to_cells(record)), func, *args,
+                                on_error=lambda e: self.show_cells_error(generation, (name,), columns, e),
+                                executor=tasks.fanout_executor)
+
+    def weather_cells(self, conditions):
+        return {'temperature': conditions.temperature, 'condition': conditions.condition}
+
+    def lift_status_cells(self, lift_status):
+        return {'base': lift_status.base, 'lifts_open': len(lift_status.lifts_open)}
+
+    def show_travel_times(self, generation, travel_times):
+        minutes = {travel_time.resort: travel_time.travel_time_minutes for travel_time in travel_times}
+        for name in self.resort_names:
+            self.show_cells(generation, name, {'drive_minutes': minutes.get(name)})
+
+    def show_cells(self, generation, name, cells):
+        if generation != self.generation:
+            return
+        self.rows[name].update(cells)
+        self._trigger_refresh_table()  # Results arriving in the same frame share one re-sort
+
+    def show_cells_error(self, generation, names, columns, error):
+        if not isinstance(error, api.ApiError):
+            print(f"Error fetching comparison data: {error}")
+        for name in names:
+            self.show_cells(generation, name, dict.fromkeys(columns))
+
+    def sort_by(self, column):
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self.refresh_table()
+
+    def refresh_table(self, *args):
+        # Rows with a value in the sort column first, in order; loading or missing ones after them by name
+        column = self.sort_column
+        rows = list(self.rows.values())
+        with_value = [row for row in rows if row.get(column) is not None]
+        without_value = sorted((row for row in rows if row.get(column) is None), key=lambda row: row['resort'].casefold())
+        with_value.sort(key=lambda row: row[column].casefold() if isinstance(row[column], str) else row[column],
+                        reverse=self.sort_descending)
+
+        self.table.data = [
+            {column: formatting.format_comparison_cell(column, row.get(column), loading=column not in row) for column, _, _ in COLUMNS}
+            for row in with_value + without_value
+        ]
+        for column, heading, _ in COLUMNS:
+            arrow = (' v' if self.sort_descending else ' ^') if column == self.sort_column else ''
+            self.header_buttons[column].text = heading + arrow
+
+    def switch_to_main_menu(self, instance):
+        try:
+            app = App.get_running_app()
+            app.root.current = 'Main Menu'
+        except Exception as e:
+            print(f"Error switching to main menu: {e}")
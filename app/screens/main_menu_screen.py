@@ -1,29 +1,84 @@
 from kivy.uix.relativelayout import RelativeLayout
+from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.image import Image
-from kivy.uix.videoplayer import VideoPlayer
-from kivy.uix.video import Video
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.spinner import Spinner
+from kivy.uix.textinput import TextInput
+from kivy.properties import ObjectProperty, StringProperty
 from kivy.core.window import Window
 from kivy.app import App
-from app.config.config import resorts
-from kivy.lang import Builder
-from kivy.graphics import Rectangle, Color
+from kivy.clock import Clock
+from kivy.config import Config
+from kivy.metrics import dp
+from app.config.config import (MENU_FRAME_TIME_BUDGET_MS, MENU_IDLE_MAX_FPS, MENU_VIDEO_SOURCES, PREFETCH_HOVER_BOOST,
+                               PREFETCH_PRESS_BOOST)
+from app.utils import tasks
+from app.utils.assets import get_image_texture
+from app.utils.geolocation import location_provider
+from app.utils.prefetch import prefetch_scheduler
+from app.utils.registry import resort_registry
+import os
 import webbrowser
-import urllib.parse
+
+DEFAULT_MAX_FPS = Config.getint('graphics', 'maxfps')
+
+ALL_REGIONS = 'All regions'
+
+
+def set_max_fps(fps):
+    # Kivy only reads graphics.maxfps at startup; the running clock keeps the cap in _max_fps
+    Clock._max_fps = float(fps)
+
+def resort_button_text(location, travel_time_minutes=None):
+    text = "[color=#808080][b]" + location + "[/b][/color]"
+    if travel_time_minutes is not None:
+        text += f"  [size=24sp][color=#A0A0A0]{travel_time_minutes} min[/color][/size]"
+    return text
+
+
+def load_travel_times():
+    # Runs on a worker thread: drive times to every resort from one matrix request
+    from app.utils import api  # Imported on first use, like the rest of the fetch layer (see main.py)
+
+    user_location = location_provider.get_location(timeout=10)
+    if user_location is None:
+        raise api.ApiError("Unable to determine your location.")
+    return api.fetch_travel_times(user_location)
+
+
+class ResortButton(Button):
+    # One row of the resort list. The RecycleView reuses these as the list scrolls, setting
+    # text, resort_name and menu from the row's data.
+    resort_name = StringProperty('')
+    menu = ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(markup=True, background_color=(0.3, 0.3, 0.3, .95), color=(1, 1, 1, 1),
+                         font_name='DrippyFont', font_size='39sp', bold=True, **kwargs)
+
+    def on_press(self):
+        prefetch_scheduler.boost(self.resort_name, PREFETCH_PRESS_BOOST)
+
+    def on_release(self):
+        self.menu.switch_to_resort_screen(self)
+
 
 class MainMenuScreen(RelativeLayout):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        # Create/Add Background Video
-        video = Video(source='app/videos/video_of_snowfall (1080p).mp4')
-        video.state = 'play'
-        video.options = {'eos': 'loop'}
-        video.allow_stretch = True
-        video.size = Window.size
-        video.pos_hint = {'center_x': 0.5, 'center_y': 0.5}
-        self.add_widget(video)
+        # Background video, with a still frame behind it for when the video is not running
+        self.background_image = Image(allow_stretch=True, keep_ratio=False, pos_hint={'center_x': 0.5, 'center_y': 0.5})
+        self.add_widget(self.background_image)
+        self.video = None
+        self.video_sources = [source for source in MENU_VIDEO_SOURCES if os.path.exists(source)]
+        self.video_source_index = 0
+        self.slow_frame_checks = 0
+        self.frame_budget_event = None
+        # The video is started once the first frame is up (see SkiResortWeatherApp.start_background_work)
 
         # Create label for the title
         title_label = Label(
@@ -38,35 +93,51 @@ class MainMenuScreen(RelativeLayout):
         )
         self.add_widget(title_label)
 
-        # Create buttons for each resort
-        button_width = '500dp'
-        button_height = '80dp'
-        for index, (location, _) in enumerate(resorts.items()):
-            button = Button(
-                text="[color=#808080][b]" + location + "[/b][/color]",
-                size_hint=(None, None),
-                size=(button_width, button_height),
-                markup=True,
-                background_color=(0.3, 0.3, 0.3, .95),
-                color=(1, 1, 1, 1),
-                font_name='DrippyFont',
-                font_size='39sp',
-                bold=True
-            )
-            button.bind(on_release=self.switch_to_resort_screen)
-            button.resort_location = resorts[location]['location']
-            button.pos_hint = {'center_x': 0.5, 'center_y': 0.55 - index * 0.105}
-            self.add_widget(button)
-
-            left_mirror_image = Image(source='app/images/pngwing.comcopy.png')
-            left_mirror_image.pos_hint = {'center_x': 0.27, 'center_y': 0.41}
-            left_mirror_image.size_hint = (0.4, 0.4)  # Adjust the size_hint to make the image smaller
-            self.add_widget(left_mirror_image)
-
-            right_mirror_image = Image(source='app/images/pngwing.com.png')
-            right_mirror_image.pos_hint = {'center_x': 0.73, 'center_y': 0.41}
-            right_mirror_image.size_hint = (0.4, 0.4)  # Adjust the size_hint to make the image smaller
-            self.add_widget(right_mirror_image)
+        # Mirror images on either side of the buttons, drawn once from the shared texture cache
+        left_mirror_image = Image(texture=get_image_texture('app/images/pngwing.comcopy.png'))
+        left_mirror_image.pos_hint = {'center_x': 0.27, 'center_y': 0.41}
+        left_mirror_image.size_hint = (0.4, 0.4)  # Adjust the size_hint to make the image smaller
+        self.add_widget(left_mirror_image)
+
+        right_mirror_image = Image(texture=get_image_texture('app/images/pngwing.com.png'))
+        right_mirror_image.pos_hint = {'center_x': 0.73, 'center_y': 0.41}
+        right_mirror_image.size_hint = (0.4, 0.4)  # Adjust the size_hint to make the image smaller
+        self.add_widget(right_mirror_image)
+
+        # Search and region filter for the resort list
+        filter_row = BoxLayout(size_hint=(None, None), size=('500dp', '44dp'), spacing='5dp',
+                               pos_hint={'center_x': 0.5, 'center_y': 0.6})
+        self.search_input = TextInput(hint_text='Search resorts', multiline=False, font_size='20sp')
+        self.region_spinner = Spinner(text=ALL_REGIONS, values=[ALL_REGIONS] + resort_registry.regions(),
+                                      size_hint_x=None, width='150dp', background_color=(0.3, 0.3, 0.3, .95))
+        # Compares every resort the search and filter leave in the list
+        compare_button = Button(text='Compare', size_hint_x=None, width='110dp', background_color=(0.3, 0.3, 0.3, .95))
+        compare_button.bind(on_release=self.open_comparison)
+        filter_row.add_widget(self.search_input)
+        filter_row.add_widget(self.region_spinner)
+        filter_row.add_widget(compare_button)
+        self.add_widget(filter_row)
+
+        # Resort list: the RecycleView only creates buttons for the rows on screen, so the menu
+        # stays just as quick to build and scroll with hundreds of resorts in the catalog
+        self.travel_minutes = {}  # Resort name -> drive time shown on its button
+        self.travel_times_loading = False
+        self.hovered_button = None
+        self.resort_list = RecycleView(size_hint=(None, 0.45), width='500dp', pos_hint={'center_x': 0.5, 'top': 0.565},
+                                       bar_width='6dp', scroll_type=['bars', 'content'])
+        resort_list_layout = RecycleBoxLayout(orientation='vertical', default_size=(None, dp(80)), default_size_hint=(1, None),
+                                              size_hint_y=None, spacing='4dp')
+        resort_list_layout.bind(minimum_height=resort_list_layout.setter('height'))
+        self.resort_list.add_widget(resort_list_layout)
+        self.resort_list.viewclass = ResortButton  # Only takes effect once the layout manager is added
+        self.add_widget(self.resort_list)
+
+        # Typing is coalesced into one re-filter per frame; Enter opens the first match
+        self._trigger_refresh_resort_list = Clock.create_trigger(self.refresh_resort_list)
+        self.search_input.bind(text=lambda *args: self._trigger_refresh_resort_list(),
+                               on_text_validate=self.open_first_match)
+        self.region_spinner.bind(text=lambda *args: self._trigger_refresh_resort_list())
+        self.refresh_resort_list()
 
         # Add watermark label
         watermark_label = Label(
@@ -94,6 +165,102 @@ class MainMenuScreen(RelativeLayout):
         license_label.bind(on_ref_press=self.open_link)
         self.add_widget(license_label)
 
+        # Hovering a resort button moves it up the prefetch queue
+        Window.bind(mouse_pos=self.on_mouse_pos)
+
+    def refresh_travel_times(self, *args):
+        # Cheap to repeat: the matrix is cached per location cell for a few minutes. At most one
+        # lookup at a time, since each can hold a fetch worker while the location resolves.
+        if self.travel_times_loading:
+            return
+        self.travel_times_loading = True
+        tasks.run_in_background(load_travel_times, self.show_travel_times, on_error=self.travel_times_failed)
+
+    def travel_times_failed(self, error):
+        self.travel_times_loading = False
+        print(f"Error fetching travel times: {error}")
+
+    def show_travel_times(self, travel_times):
+        self.travel_times_loading = False
+        self.travel_minutes = {travel_time.resort: travel_time.travel_time_minutes for travel_time in travel_times}
+        self.refresh_resort_list()
+
+    def refresh_resort_list(self, *args):
+        region = self.region_spinner.text if self.region_spinner.text != ALL_REGIONS else None
+        self.resort_list.data = [
+            {'text': resort_button_text(name, self.travel_minutes.get(name)), 'resort_name': name, 'menu': self}
+            for name in resort_registry.search(self.search_input.text, region)
+        ]
+
+    def visible_resort_buttons(self):
+        # Only the rows currently on screen exist as widgets
+        return [button for button in self.resort_list.layout_manager.children if isinstance(button, ResortButton)]
+
+    def open_first_match(self, *args):
+        self.refresh_resort_list()
+        if self.resort_list.data:
+            self.open_resort(self.resort_list.data[0]['resort_name'])
+
+    def start_background_video(self, *args):
+        if self.video is not None:
+            return
+        if self.video_source_index >= len(self.video_sources):
+            # Over budget on every video (or none installed): keep the still frame and idle the clock
+            set_max_fps(MENU_IDLE_MAX_FPS)
+            return
+
+        # Importing Video loads the video provider, which is slow, so leave it until a video plays
+        from kivy.uix.video import Video
+
+        set_max_fps(DEFAULT_MAX_FPS)
+        self.video = Video(source=self.video_sources[self.video_source_index])
+        self.video.state = 'play'
+        self.video.options = {'eos': 'loop'}
+        self.video.allow_stretch = True
+        self.video.size = Window.size
+        self.video.pos_hint = {'center_x': 0.5, 'center_y': 0.5}
+        self.add_widget(self.video, index=len(self.children) - 1)  # Just above the still frame
+        self.slow_frame_checks = 0
+        self.frame_budget_event = Clock.schedule_interval(self.check_frame_budget, 2)
+
+    def stop_background_video(self, *args):
+        # Unload the video so it stops decoding, keeping its last frame on screen
+        if self.frame_budget_event is not None:
+            self.frame_budget_event.cancel()
+            self.frame_budget_event = None
+        if self.video is not None:
+            if self.video.texture is not None:
+                self.background_image.texture = self.video.texture
+            self.video.unload()
+            self.remove_widget(self.video)
+            self.video = None
+        set_max_fps(DEFAULT_MAX_FPS)
+
+    def check_frame_budget(self, dt):
+        fps = Clock.get_fps()
+        if fps and 1000 / fps > MENU_FRAME_TIME_BUDGET_MS:
+            self.slow_frame_checks += 1
+        else:
+            self.slow_frame_checks = 0
+
+        # Three slow samples in a row: fall back to the next lower resolution or the still frame
+        if self.slow_frame_checks >= 3:
+            self.stop_background_video()
+            self.video_source_index += 1
+            self.start_background_video()
+
+    def on_mouse_pos(self, window, pos):
+        if not self.get_root_window():
+            return  # Menu is not on screen
+        hovered_button = None
+        for button in self.visible_resort_buttons():
+            if button.collide_point(*button.to_widget(*pos)):
+                hovered_button = button
+                break
+        if hovered_button is not None and hovered_button is not self.hovered_button:
+            prefetch_scheduler.boost(hovered_button.resort_name, PREFETCH_HOVER_BOOST)
+        self.hovered_button = hovered_button
+
     def open_link(self, instance, ref):
         if ref == 'github':
             webbrowser.open('https://github.com/kyledobash')
@@ -101,14 +268,25 @@ class MainMenuScreen(RelativeLayout):
             webbrowser.open('https://mit-license.org/')
             pass
 
+    def open_comparison(self, *args):
+        app = App.get_running_app()
+        app.get_comparison_screen().load([row['resort_name'] for row in self.resort_list.data])
+        app.root.current = 'Compare'
+
     def switch_to_resort_screen(self, button):
+        self.open_resort(button.resort_name)  # The button text also carries the drive time
+
+    def open_resort(self, location):
         app = App.get_running_app()
 
-        # Get the instance of ResortScreen from the ScreenManager using the location without markup
-        resort_screen = app.root.get_screen(urllib.parse.unquote(button.text.replace('[color=#808080][b]', '').replace('[/b][/color]', ''))).children[0]
+        prefetch_scheduler.record_visit(location)
+        prefetch_scheduler.pause()
+
+        # Get (or build on first visit) the ResortScreen for the location without markup
+        resort_screen = app.get_resort_screen(location)
 
         # Fetch the data for the specific resort screen
         resort_screen.fetch_data()
 
         # Switch to the specific resort screen
-        app.root.current = urllib.parse.unquote(button.text.replace('[color=#808080][b]', '').replace('[/b][/color]', ''))
\ No newline at end of file
+        app.root.current = location
@@ -6,18 +6,20 @@ from kivy.uix.button import Button
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.image import Image
 from kivy.uix.label import Label
-from kivy.uix.image import AsyncImage
 from kivy.uix.scrollview import ScrollView
 from kivy.metrics import dp
 from kivy.uix.carousel import Carousel
+import functools
 import webbrowser
-import ssl
-import requests
 
-from app.config.config import resorts
-from app.utils import api
-from app.utils.geolocation import get_user_location
+from app.config.config import ROADCAM_MAX_SIZE, resorts
+from app.utils import api, cache, formatting, roadcams, tasks
+from app.utils.geolocation import location_provider
+from app.utils.snapshots import snapshot_store
+from app.widgets.heading import HeadingLabel
 from app.widgets.label import CustomLabel
+from app.widgets.metrics_overlay import toggle_metrics_overlay
+from app.widgets.roadcam_image import RoadcamImage
 
 
 class ResortScreen(BoxLayout):
@@ -28,6 +30,10 @@ class ResortScreen(BoxLayout):
         self.twitter_handle = twitter_handle
         self.twitter_api_user_id = twitter_api_user_id
         self.roadcam_img_src_urls = roadcam_img_src_urls
+        self.panel_records = {}  # Last record shown in each data label
+        self.snapshots = None  # Last known record per panel from an earlier visit, loaded on first fetch
+        self.snapshot_texts = {}  # Label -> (text, age) while it still shows a last known record
+        self.released = False  # Set once the screen is evicted; fetches still in flight are then ignored
 
         # Initialize UI components
         self.init_ui()
@@ -57,13 +63,7 @@ class ResortScreen(BoxLayout):
 
         # Traffic info container
         traffic_info_container = BoxLayout(orientation='vertical')
-        traffic_info_title = CustomLabel(
-            text="[color=#FFD700][b]Traffic[/b][/color]",
-            halign='center',
-            markup=True,
-            font_name='DrippyFont',
-            font_size='35sp'
-        )
+        traffic_info_title = HeadingLabel(text="[color=#FFD700][b]Traffic[/b][/color]", font_name='DrippyFont', font_size='35sp')
         self.traffic_info_label = CustomLabel(text="Fetching traffic info...", font_size='18sp', halign='center')
         traffic_info_container.add_widget(traffic_info_title)
         traffic_info_container.add_widget(self.traffic_info_label)
@@ -71,13 +71,7 @@ class ResortScreen(BoxLayout):
 
         # Twitter data container
         twitter_data_container = BoxLayout(orientation='vertical')
-        twitter_data_title = CustomLabel(
-            text="[color=#FFD700][b]Twitter[/b][/color]",
-            halign='center',
-            markup=True,
-            font_name='DrippyFont',
-            font_size='35sp',
-        )
+        twitter_data_title = HeadingLabel(text="[color=#FFD700][b]Twitter[/b][/color]", font_name='DrippyFont', font_size='35sp')
         self.twitter_data_label = CustomLabel(
             text="Fetching Tweets...",
             font_size='18sp',
@@ -89,13 +83,7 @@ class ResortScreen(BoxLayout):
 
         # Create the roadcam images container and label
         self.roadcam_images_container = BoxLayout(orientation='vertical')
-        roadcams_data_title = CustomLabel(
-            text="[color=#FFD700][b]Roadcams[/b][/color]",
-            halign='center',
-            markup=True,
-            font_name='DrippyFont',
-            font_size='35sp',
-        )
+        roadcams_data_title = HeadingLabel(text="[color=#FFD700][b]Roadcams[/b][/color]", font_name='DrippyFont', font_size='35sp')
         self.roadcam_images_label = CustomLabel(text="Fetching Roadcam Images...", font_size='18sp', halign='center')
         self.roadcam_images_container.add_widget(roadcams_data_title)
         self.roadcam_images_container.add_widget(self.roadcam_images_label)
@@ -103,13 +91,7 @@ class ResortScreen(BoxLayout):
 
         # Weather data container
         weather_data_container = BoxLayout(orientation='vertical')
-        weather_data_title = CustomLabel(
-            text="[color=#FFD700][b]Weather[/b][/color]",
-            halign='center',
-            markup=True,
-            font_name='DrippyFont',
-            font_size='35sp',
-        )
+        weather_data_title = HeadingLabel(text="[color=#FFD700][b]Weather[/b][/color]", font_name='DrippyFont', font_size='35sp')
         self.weather_label = CustomLabel(text="Fetching weather data...", font_size='18sp', halign='center')
         weather_data_container.add_widget(weather_data_title)
         weather_data_container.add_widget(self.weather_label)
@@ -117,13 +99,7 @@ class ResortScreen(BoxLayout):
 
         # Daily (forecast) data container
         forecast_data_container = BoxLayout(orientation='vertical')
-        forecast_data_title = CustomLabel(
-            text="[color=#FFD700][b]Daily Temps[/b][/color]",
-            halign='center',
-            markup=True,
-            font_name='DrippyFont',
-            font_size='35sp',
-        )
+        forecast_data_title = HeadingLabel(text="[color=#FFD700][b]Daily Temps[/b][/color]", font_name='DrippyFont', font_size='35sp')
         self.forecast_label = CustomLabel(text="Fetching forecast data...", font_size='18sp', markup=True, halign='center')
         forecast_data_container.add_widget(forecast_data_title)
         forecast_data_container.add_widget(self.forecast_label)
@@ -131,13 +107,7 @@ class ResortScreen(BoxLayout):
 
         # Hourly forecast data container
         hourly_forecast_container = BoxLayout(orientation='vertical')
-        hourly_data_title = CustomLabel(
-            text="[color=#FFD700][b]Hourly Forecast[/b][/color]",
-            halign='center',
-            markup=True,
-            font_name='DrippyFont',
-            font_size='35sp',
-        )
+        hourly_data_title = HeadingLabel(text="[color=#FFD700][b]Hourly Forecast[/b][/color]", font_name='DrippyFont', font_size='35sp')
         self.hourly_forecast_label = CustomLabel(text="Fetching hourly forecast data...", font_size='18sp', halign='center')
         hourly_forecast_container.add_widget(hourly_data_title)
         hourly_forecast_container.add_widget(self.hourly_forecast_label)
@@ -145,13 +115,7 @@ class ResortScreen(BoxLayout):
 
         # Historical data container
         historical_data_container = BoxLayout(orientation='vertical')
-        historical_data_title = CustomLabel(
-            text="[color=#FFD700][b]Past Conditions[/b][/color]",
-            halign='center',
-            markup=True,
-            font_name='DrippyFont',
-            font_size='35sp',
-        )
+        historical_data_title = HeadingLabel(text="[color=#FFD700][b]Past Conditions[/b][/color]", font_name='DrippyFont', font_size='35sp')
         self.historical_data_label = CustomLabel(text="Fetching historical current data...", font_size='18sp')
         historical_data_container.add_widget(historical_data_title)
         historical_data_container.add_widget(self.historical_data_label)
@@ -159,13 +123,7 @@ class ResortScreen(BoxLayout):
 
         # Resort data container
         resort_data_container = BoxLayout(orientation='vertical')
-        resort_data_title = CustomLabel(
-            text="[color=#FFD700][b]Resort Data[/b][/color]",
-            halign='center',
-            markup=True,
-            font_name='DrippyFont',
-            font_size='35sp',
-        )
+        resort_data_title = HeadingLabel(text="[color=#FFD700][b]Resort Data[/b][/color]", font_name='DrippyFont', font_size='35sp')
         self.resort_data_label = CustomLabel(text="Fetching resort data...", font_size='18sp', halign='center')
         resort_data_container.add_widget(resort_data_title)
         resort_data_container.add_widget(self.resort_data_label)
@@ -197,6 +155,19 @@ class ResortScreen(BoxLayout):
         twitter_button.bind(on_release=self.open_twitter_embed)
         bottom_layout.add_widget(twitter_button)
 
+        # Request timings and cache hit rates for every endpoint (also toggled with F12)
+        stats_button = Button(
+            text="[color=#808080][b]Stats[/b][/color]",
+            background_color=(0.3, 0.3, 0.3, 1),
+            color=(1, 1, 1, 1),
+            font_size='39sp',
+            font_name='DrippyFont',
+            markup=True,
+            size_hint_x=0.25
+        )
+        stats_button.bind(on_release=toggle_metrics_overlay)
+        bottom_layout.add_widget(stats_button)
+
         self.add_widget(bottom_layout)  # Add the bottom_layout to the ResortScreen widget
 
     def adjust_main_layout_width(self, instance, width):
@@ -204,6 +175,7 @@ class ResortScreen(BoxLayout):
         self.width = width - padding
 
     def fetch_data(self):
+        # Start every fetch at once; each panel fills in as soon as its own call returns
         self.fetch_traffic_info()
         self.fetch_historical_current_data()
         self.fetch_weather_data()
@@ -218,51 +190,112 @@ class ResortScreen(BoxLayout):
         label.height = label.texture_size[1]  # Update the height
         container.height = label.height  # Update the container height to match the label height
 
-    def fetch_resort_data(self):
+    def load_panel(self, label, formatter, panel, func, *args):
+        # Show the panel's last known record straight away (marked with its age), then fetch a
+        # fresh one on a worker thread and show it in label (or the ApiError message). Records
+        # are saved as the panel's last known record with the age the response cache served them
+        # at; older data a fetcher falls back to when the refresh fails is shown as such and not saved.
+        if self.snapshots is None:
+            self.snapshots = snapshot_store.load(self.location)
+        if label not in self.panel_records and panel in self.snapshots:
+            self.show_snapshot(label, formatter, *self.snapshots.pop(panel))
+
+        @functools.wraps(func)
+        def fetch(*args):
+            cache.take_served()
+            record = func(*args)
+            age, error = cache.take_served()
+            if error is None:
+                snapshot_store.save(self.location, panel, record, age or 0)
+            return record, error
+
+        def show(result):
+            record, error = result
+            if error is None:
+                self.show_panel(label, formatter, record)
+            else:
+                self.show_fallback(label, formatter, record, error)
+
+        tasks.run_in_background(fetch, show, *args, on_error=lambda e: self.show_panel_error(label, e))
+
+    def show_snapshot(self, label, formatter, record, age):
         try:
-            # Use the API method to fetch resort data
-            resort_slug = resorts[self.location]["resort_slug"]
-            resort_data = api.fetch_resort_data(resort_slug)  # Renamed the variable to avoid conflict
-
-            if resort_data is None:
-                self.resort_data_label.text = f"Resort data not available for {self.location}"
-                return
-
-            # Format and update the resort data label
-            lifts_status = resort_data.get('lifts', {}).get('status', {})
-            lifts_open = [lift for lift, status in lifts_status.items() if status == 'open']
-            lifts_open_str = ', '.join(lifts_open)
-            conditions = resort_data.get('conditions', {})
-            self.resort_data_label.text = f"Lifts Open: {lifts_open_str}\nConditions: Base {conditions.get('base', 0)} cm, Season Total {conditions.get('season', 0)} cm"
+            text = formatter(record)
         except Exception as e:
-            print(f"Error fetching resort data: {e}")
-
-    def fetch_hourly_forecast_data(self):
+            print(f"Error displaying saved data for {self.location}: {e}")
+            return
+        self.snapshot_texts[label] = (text, age)
+        label.set_text(f"{text}\n(Last updated {formatting.format_age(age)}, refreshing...)")
+
+    def show_panel(self, label, formatter, record):
+        if self.released:
+            return
+        # A refresh that returns exactly what is already on screen doesn't need re-rendering
+        if self.panel_records.get(label) == record:
+            return
+        self.panel_records[label] = record
+        self.snapshot_texts.pop(label, None)
         try:
-            # Use the API method to fetch hourly forecast data
-            location_key = resorts[self.location]["accuweather_key"]
-            hourly_forecast_data = api.fetch_hourly_forecast_data(location_key)
-            self.hourly_forecast_label.text = hourly_forecast_data
+            label.set_text(formatter(record))
         except Exception as e:
-            print(f"Error fetching hourly forecast data: {e}")
+            print(f"Error displaying data for {self.location}: {e}")
+
+    def show_panel_error(self, label, error):
+        if self.released:
+            return
+        if isinstance(error, api.ApiError):
+            self.panel_records.pop(label, None)
+            if label in self.snapshot_texts:
+                # Offline: keep showing the last known data rather than only the error
+                self.show_snapshot_unrefreshed(label, error)
+            else:
+                label.set_text(str(error))
+        else:
+            print(f"Error fetching data for {self.location}: {error}")
+
+    def show_fallback(self, label, formatter, record, error):
+        # The refresh failed and the fetcher answered with older data (an expired cache entry or
+        # its local store). A saved snapshot carries the real age, so it wins; otherwise the
+        # older data is shown, marked as not refreshed.
+        if self.released:
+            return
+        self.panel_records.pop(label, None)
+        if label in self.snapshot_texts:
+            self.show_snapshot_unrefreshed(label, error)
+            return
+        print(f"Error refreshing data for {self.location}: {error}")
+        try:
+            label.set_text(f"{formatter(record)}\n(Couldn't refresh)")
+        except Exception as e:
+            print(f"Error displaying data for {self.location}: {e}")
 
-    ssl._create_default_https_context = ssl._create_unverified_context
+    def show_snapshot_unrefreshed(self, label, error):
+        text, age = self.snapshot_texts[label]
+        label.set_text(f"{text}\n(Last updated {formatting.format_age(age)}, couldn't refresh)")
+        print(f"Error refreshing data for {self.location}: {error}")
+
+    def fetch_resort_data(self):
+        resort_slug = resorts[self.location]["resort_slug"]
+        self.load_panel(self.resort_data_label, formatting.format_lift_status, "resort", api.fetch_resort_data, resort_slug)
+
+    def fetch_hourly_forecast_data(self):
+        location_key = resorts[self.location]["accuweather_key"]
+        self.load_panel(self.hourly_forecast_label, formatting.format_hourly_forecast, "hourly", api.fetch_hourly_forecast_data, location_key)
 
     def fetch_roadcam_images(self):
+        # Decode at the size the carousel actually occupies, once it has been laid out
+        width, height = self.roadcam_images_container.size
+        max_size = (int(width), int(height)) if width > 100 and height > 100 else ROADCAM_MAX_SIZE
+        tasks.run_in_background(roadcams.fetch_roadcam_images, self.update_roadcam_images, self.roadcam_img_src_urls, max_size)
+
+    def update_roadcam_images(self, roadcam_images):
+        if self.released:
+            return  # Evicted while the images were downloading; don't start new GIF animations
         try:
-            roadcam_images = []
-            for img_src_url in self.roadcam_img_src_urls:
-                response = requests.get(img_src_url, verify=False)
-                if response.status_code == 200:
-                    roadcam_images.append(img_src_url)
-                    print(f"Added image with source: {img_src_url}")
-
             if roadcam_images:
                 if not hasattr(self, "carousel"):
                     self.carousel = Carousel(direction='right')
-                    for img_src_url in roadcam_images:
-                        image = AsyncImage(source=img_src_url, allow_stretch=True, keep_ratio=True)
-                        self.carousel.add_widget(image)
+                    self.roadcam_slides = {}
                     self.roadcam_images_container.remove_widget(self.roadcam_images_label)
                     self.roadcam_images_container.add_widget(self.carousel)
                     previous_button = Button(text="[color=#808080][b]Previous[/b][/color]", background_color=(0.3, 0.3, 0.3, 1), color=(1, 1, 1, 1), font_size='25sp', font_name='DrippyFont', markup=True)
@@ -273,73 +306,57 @@ class ResortScreen(BoxLayout):
                     bottom_layout.add_widget(previous_button)
                     bottom_layout.add_widget(next_button)
                     self.roadcam_images_container.add_widget(bottom_layout)
-            else:
-                self.roadcam_images_label.text = "No Roadcam Images Available"
+
+                # Add new cameras and swap in images that changed; 304s keep their existing texture
+                for frame in roadcam_images:
+                    slide = self.roadcam_slides.get(frame.url)
+                    if slide is None:
+                        slide = RoadcamImage(frame.url, frame.image, allow_stretch=True, keep_ratio=True)
+                        self.roadcam_slides[frame.url] = slide
+                        self.carousel.add_widget(slide)
+                    else:
+                        slide.set_decoded_image(frame.image)
+            elif not hasattr(self, "carousel"):
+                self.roadcam_images_label.set_text("No Roadcam Images Available")
         except Exception as e:
             print(f"Error fetching roadcam images: {e}")
 
     def fetch_traffic_info(self):
-        try:
-            # Use the API method to fetch traffic info
-            resort_location = resorts[self.location]["location"]
-            user_location = get_user_location()  # Use the PHYSICAL_ADDRESS from config.py as the user's location
-            traffic_info = api.fetch_traffic_info(user_location, resort_location)
-            self.traffic_info_label.text = traffic_info
-        except Exception as e:
-            print(f"Error fetching traffic info: {e}")
+        resort_location = resorts[self.location]["location"]
+        self.load_panel(self.traffic_info_label, formatting.format_route_info, "traffic", self.load_traffic_info, resort_location)
+
+    def load_traffic_info(self, resort_location):
+        # Runs on a worker thread; the location is normally already memoized, so this only
+        # waits when the very first lookup is still in flight
+        user_location = location_provider.get_location(timeout=10)
+        if user_location is None:
+            raise api.ApiError("Unable to determine your location for traffic info.")
+        return api.fetch_traffic_info(user_location, resort_location)
 
     def fetch_historical_current_data(self):
-        try:
-            # Use the API method to fetch historical current data
-            location_key = resorts[self.location]["accuweather_key"]
-            historical_current_data = api.fetch_historical_current_data(location_key)
-            self.historical_data_label.text = historical_current_data
-            self.historical_data_label.texture_update()  # Update the texture to calculate the new size
-            self.historical_data_label.height = self.historical_data_label.texture_size[1]  # Update the height
-        except Exception as e:
-            print(f"Error fetching historical current data: {e}")
+        location_key = resorts[self.location]["accuweather_key"]
+        self.load_panel(self.historical_data_label, formatting.format_historical_conditions, "historical", api.fetch_historical_current_data, location_key)
 
     def fetch_weather_data(self):
-        try:
-            # Use the API method to fetch weather data
-            location_key = resorts[self.location]["accuweather_key"]
-            weather_data = api.fetch_weather_data(location_key)
-            self.weather_label.text = weather_data
-        except Exception as e:
-            print(f"Error fetching weather data: {e}")
+        location_key = resorts[self.location]["accuweather_key"]
+        self.load_panel(self.weather_label, formatting.format_current_conditions, "current", api.fetch_weather_data, location_key)
 
     def fetch_forecast_data(self):
-        try:
-            # Use the API method to fetch forecast data
-            location_key = resorts[self.location]["accuweather_key"]
-            forecast_data = api.fetch_forecast_data(location_key)
-            self.forecast_label.text = forecast_data
-        except Exception as e:
-            print(f"Error fetching forecast data: {e}")
+        location_key = resorts[self.location]["accuweather_key"]
+        self.load_panel(self.forecast_label, formatting.format_daily_forecast, "daily", api.fetch_forecast_data, location_key)
 
     def fetch_twitter_data(self):
-        try:
-            # Use the API method to fetch Twitter data
-            twitter_data = api.fetch_user_tweets(self.twitter_handle)
-
-            if twitter_data is None or len(twitter_data) == 0:
-                self.twitter_data_label.text = f"No tweets available for {self.location}"
-                return
-
-            # Iterate over the first three tweets in the list
-            tweet_texts = []
-            for tweet in twitter_data[:3]:
-                created_at = tweet.get('created_at')
-                text = tweet.get('text')
-
-                # Create a string with the tweet data
-                tweet_text = f"Created at: {created_at}\nText: {text}"
-                tweet_texts.append(tweet_text)
-
-            # Update the Twitter data label with the combined tweet texts
-            self.twitter_data_label.text = "\n\n".join(tweet_texts)
-        except Exception as e:
-            print(f"Error fetching Twitter data: {e}")
+        format_tweets = functools.partial(formatting.format_tweets, location=self.location)
+        self.load_panel(self.twitter_data_label, format_tweets, "tweets", api.fetch_user_tweets, self.twitter_handle)
+
+    def release(self):
+        # Called when the screen is evicted: stop GIF animations and drop roadcam textures
+        self.released = True
+        if hasattr(self, "carousel"):
+            for slide in self.roadcam_slides.values():
+                slide.release()
+            self.carousel.clear_widgets()
+            self.roadcam_slides.clear()
 
     def open_twitter_embed(self, *args):
         try:
@@ -1,21 +1,55 @@
 # app/utils/api.py
 import os
+import time
 import requests
-import datetime
-from kivy.uix.image import AsyncImage
-from PIL import Image as PilImage
-from io import BytesIO
-from kivy.uix.image import Image
-from datetime import datetime, timedelta
-
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from app.config.config import (API_BASE_URLS, HISTORY_REFRESH_AFTER, TRAVEL_TIME_CELL_DEGREES, TWEET_FETCH_COUNT,
+                               resorts)
+from app.utils import cache, http_client
+from app.utils.models import (CurrentConditions, DailyForecast, HourlyPoint, LiftStatus, RouteInfo, TrafficIncident,
+                              TravelTime, Tweet)
+from app.utils.ratelimit import rate_limiter
+from app.utils.timeseries import observation_store
+from app.utils.tweet_store import tweet_store
+
+# Runs the AccuWeather calls of a conditions bundle side by side
+_bundle_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bundle')
+
+
+class ApiError(Exception):
+    # A fetch that produced no data; the message is meant to be shown in place of the panel
+    pass
+
+
+def _api_error(message, cause):
+    # An ApiError to return rather than raise, chained to cause as `raise ApiError(...) from cause`
+    # would, so callers can still tell what went wrong (e.g. ratelimit.QuotaExceeded)
+    error = ApiError(message)
+    error.__cause__ = cause
+    return error
+
+
+def _get_json(endpoint, url, params=None, headers=None):
+    # GET a JSON document; non-2xx responses raise requests.exceptions.HTTPError. Every upstream
+    # call is charged to its API's rate limit and daily budget first.
+    params = params or {}
+    headers = headers or {}
+    api_key = params.get("apikey") or params.get("key") or headers.get("X-RapidAPI-Key")
+    rate_limiter.acquire(url, api_key, rate_limiter.priority_for(endpoint))
+    response = http_client.get(url, endpoint, params=params, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+@cache.cached("traffic")
 def fetch_traffic_info(user_location, resort_location):
     # Fetch traffic info from the user's current location to the specific resort using the Bing Maps API
     bing_maps_api_key = os.getenv("BING_MAPS_API_KEY")
     if not bing_maps_api_key:
-        return "BING_MAPS_API_KEY is not set."
+        raise ApiError("BING_MAPS_API_KEY is not set.")
 
     # Create the route URL with the provided start and end points, and API key
-    route_url = "http://dev.virtualearth.net/REST/V1/Routes/Driving"
+    route_url = f"{API_BASE_URLS['bing']}/REST/V1/Routes/Driving"
 
     try:
         params = {
@@ -25,94 +59,145 @@ def fetch_traffic_info(user_location, resort_location):
             "key": bing_maps_api_key,
             "incidents": True  # Include traffic incidents in the response
         }
-        response = requests.get(route_url, params=params)
-        route_data = response.json()
-
-        if "resourceSets" in route_data and route_data["resourceSets"]:
-            resource = route_data["resourceSets"][0]["resources"][0]
-
-            # Extract traffic info here, e.g., estimated travel time, road conditions, etc.
-            travel_time_minutes = resource.get("travelDurationTraffic", 0) // 60
-            road_conditions = resource.get("trafficCongestion", "Unknown")
-
-            incidents_info_str = ""
-            if "trafficIncidents" in resource:
-                incidents = resource["trafficIncidents"]
-                incidents_info_str = "Traffic Incidents:\n"
-                for incident in incidents:
-                    incident_type = incident.get("type", "Unknown")
-                    description = incident.get("description", "No description")
-                    start = incident.get("start", "Unknown")
-                    end = incident.get("end", "Unknown")
-                    incidents_info_str += f"Incident Type: {incident_type}\n"
-                    incidents_info_str += f"Description: {description}\n"
-                    incidents_info_str += f"Start Time: {start}\n"
-                    incidents_info_str += f"End Time: {end}\n\n"
-
-            # Calculate estimated arrival time
-            current_time = datetime.now()
-            travel_time_delta = timedelta(minutes=travel_time_minutes)
-            arrival_time = current_time + travel_time_delta
-
-            # Format the arrival time as "HH:MM AM/PM"
-            formatted_arrival_time = arrival_time.strftime("%I:%M %p")
-
-            # Get traffic severity
-            traffic_severity = resource.get("trafficSeverity", "Unknown")
-
-            # Display the traffic info for the specific resort, including any incidents
-            traffic_info_str = f"Travel Time to {resort_location}: {travel_time_minutes} minutes\n"
-            traffic_info_str += f"Estimated Arrival Time: {formatted_arrival_time}\n"
-            traffic_info_str += f"Road Conditions: {road_conditions.capitalize()}\n"
-            traffic_info_str += f"Traffic Severity: {traffic_severity.capitalize()}\n"
-            traffic_info_str += incidents_info_str
-
-            return traffic_info_str
-        else:
-            return f"No route data found for {resort_location} using Bing Maps API."
+        route_data = _get_json("traffic", route_url, params=params)
     except requests.exceptions.RequestException as e:
-        return f"Error fetching traffic data for {resort_location}: {e}"
+        raise ApiError(f"Error fetching traffic data for {resort_location}: {e}") from e
+
+    if "resourceSets" in route_data and route_data["resourceSets"]:
+        resource = route_data["resourceSets"][0]["resources"][0]
+
+        # Extract traffic info here, e.g., estimated travel time, road conditions, etc.
+        incidents = tuple(
+            TrafficIncident(
+                type=incident.get("type", "Unknown"),
+                description=incident.get("description", "No description"),
+                start=incident.get("start", "Unknown"),
+                end=incident.get("end", "Unknown"),
+            )
+            for incident in resource.get("trafficIncidents", [])
+        )
+        return RouteInfo(
+            destination=resort_location,
+            travel_time_minutes=resource.get("travelDurationTraffic", 0) // 60,
+            congestion=resource.get("trafficCongestion", "Unknown"),
+            severity=resource.get("trafficSeverity", "Unknown"),
+            incidents=incidents,
+        )
+    else:
+        raise ApiError(f"No route data found for {resort_location} using Bing Maps API.")
+
+
+def location_cell(user_location):
+    # Snap "lat,lng" to the corner of its TRAVEL_TIME_CELL_DEGREES cell, so positions a few hundred
+    # meters apart share one cached travel time matrix
+    lat, lng = (float(value) for value in user_location.split(","))
+    return "{:.4f},{:.4f}".format(lat - lat % TRAVEL_TIME_CELL_DEGREES, lng - lng % TRAVEL_TIME_CELL_DEGREES)
+
+
+def fetch_travel_times(user_location):
+    # Driving time from the user's location to every resort, from one Bing Distance Matrix call.
+    # Returns a tuple of TravelTime in config order, leaving out resorts Bing found no route to.
+    return _fetch_travel_times(location_cell(user_location))
+
+
+@cache.cached("travel_times")
+def _fetch_travel_times(origin):
+    bing_maps_api_key = os.getenv("BING_MAPS_API_KEY")
+    if not bing_maps_api_key:
+        raise ApiError("BING_MAPS_API_KEY is not set.")
 
+    names = list(resorts)
+    params = {
+        "origins": origin,
+        "destinations": ";".join(resorts[name]["coordinates"] for name in names),
+        "travelMode": "driving",
+        "distanceUnit": "mi",
+        "timeUnit": "minute",
+        "key": bing_maps_api_key,
+    }
+    try:
+        matrix_data = _get_json("travel_times", f"{API_BASE_URLS['bing']}/REST/v1/Routes/DistanceMatrix", params=params)
+    except requests.exceptions.RequestException as e:
+        raise ApiError(f"Error fetching travel times: {e}") from e
 
-def fetch_historical_current_data(location_key):
-    # Fetch historical current conditions for the past 24 hours from AccuWeather using location key
+    try:
+        results = matrix_data["resourceSets"][0]["resources"][0]["results"]
+    except (KeyError, IndexError):
+        raise ApiError("No travel time data found using Bing Maps API.")
+    # Cells Bing couldn't route come back with negative values
+    return tuple(
+        TravelTime(resort=names[result["destinationIndex"]], travel_time_minutes=round(result["travelDuration"]),
+                   distance_miles=result["travelDistance"])
+        for result in sorted(results, key=lambda result: result["destinationIndex"])
+        if result.get("travelDuration", -1) >= 0
+    )
+
+
+def _parse_hourly_point(data, time_field, temperature):
+    return HourlyPoint(
+        time=datetime.strptime(data.get(time_field), "%Y-%m-%dT%H:%M:%S%z"),
+        temperature=temperature,
+        condition=data.get("WeatherText") or data.get("IconPhrase"),
+    )
+
+
+@cache.cached("historical")
+def fetch_historical_current_data(location_key, hours=24):
+    # Past conditions for the last hours hours, oldest first, served from the local observation
+    # store. The store is first topped up with only what it hasn't seen: nothing while the newest
+    # stored observation is under HISTORY_REFRESH_AFTER old, AccuWeather's 6-hour series when it
+    # is less than 6 hours old, the 24-hour series otherwise. Windows longer than 24 hours are
+    # answered from what has accumulated locally.
+    error = None
+    latest = observation_store.latest(location_key)
+    age = time.time() - latest if latest is not None else None
+    if age is None or age >= HISTORY_REFRESH_AFTER:
+        error = _update_observations(location_key, "historical" if age is not None and age < 6 * 60 * 60 else "historical/24")
+
+    points = observation_store.window(location_key, hours)
+    if points and error is not None:
+        raise cache.StaleResult(points, error)  # Only what was stored before; shown as such
+    if points:
+        return points
+    raise error or ApiError(f"Historical current conditions data not available for the past {hours} hours in {location_key}")
+
+
+def _update_observations(location_key, series):
+    # Store the observations in AccuWeather's historical (6 hour) or historical/24 series;
+    # returns the ApiError if they couldn't be fetched
     ACCUWEATHER_API_KEY = os.getenv("ACCUWEATHER_API_KEY")
     if not ACCUWEATHER_API_KEY:
-        return "ACCUWEATHER_API_KEY is not set."
+        return ApiError("ACCUWEATHER_API_KEY is not set.")
 
+    # Only temperature and weather text are shown, so skip the detailed payload
     historical_current_params = {
         "apikey": ACCUWEATHER_API_KEY,
-        "details": True,
+        "details": False,
         "metric": False,
-        "hours": "24",
     }
 
     try:
-        historical_current_response = requests.get(f"http://dataservice.accuweather.com/currentconditions/v1/{location_key}/historical/24", params=historical_current_params)
-        historical_current_data = historical_current_response.json()
-
-        if historical_current_data and isinstance(historical_current_data, list):
-            # Extract and format historical current conditions data for display
-            historical_current_data_str = "Historical Current Conditions (Past 24 Hours):\n"
-            last_12_hours_data = historical_current_data[-12:]  # Get the last 12 hours of data
-            for data in last_12_hours_data:
-                time_str = data.get("LocalObservationDateTime")
-                time = datetime.strptime(time_str, "%Y-%m-%dT%H:%M:%S%z")
-                formatted_time = time.strftime("%b %d %H:%M")  # Format: Month Day Hour:Minute
-                temp = data.get("Temperature", {}).get("Imperial", {}).get("Value")
-                condition = data.get("WeatherText")
-                historical_current_data_str += f"{formatted_time} - Temp: {temp}°F - Condition: {condition}\n"
-            return historical_current_data_str
-        else:
-            return f"Historical current conditions data not available for the past 24 hours in {location_key}"
+        historical_current_data = _get_json("historical", f"{API_BASE_URLS['accuweather']}/currentconditions/v1/{location_key}/{series}", params=historical_current_params)
     except requests.exceptions.RequestException as e:
-        return f"Failed to fetch historical current conditions data for {location_key}: {e}"
+        return _api_error(f"Failed to fetch historical current conditions data for {location_key}: {e}", e)
+
+    if historical_current_data and isinstance(historical_current_data, list):
+        observation_store.add(location_key, _parse_observations(historical_current_data))
+    return None
+
+
+def _parse_observations(historical_current_data):
+    return [
+        _parse_hourly_point(data, "LocalObservationDateTime", data.get("Temperature", {}).get("Imperial", {}).get("Value"))
+        for data in historical_current_data
+    ]
 
+@cache.cached("current")
 def fetch_weather_data(location_key):
     # Fetch current weather data from AccuWeather using location key
     ACCUWEATHER_API_KEY = os.getenv("ACCUWEATHER_API_KEY")
     if not ACCUWEATHER_API_KEY:
-        return "ACCUWEATHER_API_KEY is not set."
+        raise ApiError("ACCUWEATHER_API_KEY is not set.")
 
     current_params = {
         "apikey": ACCUWEATHER_API_KEY,
@@ -120,123 +205,133 @@ def fetch_weather_data(location_key):
     }
 
     try:
-        current_response = requests.get(f"http://dataservice.accuweather.com/currentconditions/v1/{location_key}", params=current_params)
-        current_data = current_response.json()
-
-        if current_data and isinstance(current_data, list):
-            weather_data = current_data[0]
-
-            # Extract weather data
-            current_temp = weather_data.get("Temperature", {}).get("Imperial", {}).get("Value")
-            current_condition = weather_data.get("WeatherText")
-            humidity = weather_data.get("RelativeHumidity")
-            wind_speed = weather_data.get("Wind", {}).get("Speed", {}).get("Imperial", {}).get("Value")
-            visibility = weather_data.get("Visibility", {}).get("Imperial", {}).get("Value")
-
-            # Format current weather data for display
-            location_data = f"Current Conditions\n"
-            location_data += f"Temperature: {current_temp}°F\n"
-            location_data += f"Conditions: {current_condition}\n"
-            location_data += f"Humidity: {humidity}%\n"
-            location_data += f"Wind Speed: {wind_speed} mph\n"
-            location_data += f"Visibility: {visibility} miles\n"
-            return location_data
-        else:
-            return f"Weather data not available for {location_key}"
+        current_data = _get_json("current", f"{API_BASE_URLS['accuweather']}/currentconditions/v1/{location_key}", params=current_params)
     except requests.exceptions.RequestException as e:
-        return f"Failed to fetch weather data for {location_key}: {e}"
-
+        raise ApiError(f"Failed to fetch weather data for {location_key}: {e}") from e
+
+    if current_data and isinstance(current_data, list):
+        weather_data = current_data[0]
+        return CurrentConditions(
+            temperature=weather_data.get("Temperature", {}).get("Imperial", {}).get("Value"),
+            condition=weather_data.get("WeatherText"),
+            humidity=weather_data.get("RelativeHumidity"),
+            wind_speed=weather_data.get("Wind", {}).get("Speed", {}).get("Imperial", {}).get("Value"),
+            visibility=weather_data.get("Visibility", {}).get("Imperial", {}).get("Value"),
+        )
+    else:
+        raise ApiError(f"Weather data not available for {location_key}")
+
+@cache.cached("daily")
 def fetch_forecast_data(location_key):
     # Fetch 1-day daily forecast from AccuWeather using location key
     ACCUWEATHER_API_KEY = os.getenv("ACCUWEATHER_API_KEY")
     if not ACCUWEATHER_API_KEY:
-        return "ACCUWEATHER_API_KEY is not set."
+        raise ApiError("ACCUWEATHER_API_KEY is not set.")
 
     daily_forecast_params = {
         "apikey": ACCUWEATHER_API_KEY,
-        "details": True,
+        "details": False,
     }
 
     try:
-        daily_forecast_response = requests.get(f"http://dataservice.accuweather.com/forecasts/v1/daily/1day/{location_key}", params=daily_forecast_params)
-        daily_forecast_data = daily_forecast_response.json()
-
-        if "DailyForecasts" in daily_forecast_data:
-            daily_forecast_data = daily_forecast_data["DailyForecasts"][0]
-
-            # Extract daily forecast data
-            forecast_temp_min = daily_forecast_data.get("Temperature", {}).get("Minimum", {}).get("Value")
-            forecast_temp_max = daily_forecast_data.get("Temperature", {}).get("Maximum", {}).get("Value")
-            forecast_day_condition = daily_forecast_data.get("Day", {}).get("IconPhrase")
-
-            # Format daily forecast data for display
-            forecast_data_str = f"Temperature Min: {forecast_temp_min}°F\n"
-            forecast_data_str += f"Temperature Max: {forecast_temp_max}°F\n"
-            forecast_data_str += f"Day Conditions: {forecast_day_condition}\n"
-            return forecast_data_str
-        else:
-            return f"Daily forecast data not available for {location_key}"
+        daily_forecast_data = _get_json("daily", f"{API_BASE_URLS['accuweather']}/forecasts/v1/daily/1day/{location_key}", params=daily_forecast_params)
     except requests.exceptions.RequestException as e:
-        return f"Error fetching forecast data for {location_key}: {e}"
-    
+        raise ApiError(f"Error fetching forecast data for {location_key}: {e}") from e
+
+    if "DailyForecasts" in daily_forecast_data:
+        daily_forecast_data = daily_forecast_data["DailyForecasts"][0]
+        return DailyForecast(
+            temperature_min=daily_forecast_data.get("Temperature", {}).get("Minimum", {}).get("Value"),
+            temperature_max=daily_forecast_data.get("Temperature", {}).get("Maximum", {}).get("Value"),
+            day_condition=daily_forecast_data.get("Day", {}).get("IconPhrase"),
+        )
+    else:
+        raise ApiError(f"Daily forecast data not available for {location_key}")
+
+@cache.cached("hourly")
 def fetch_hourly_forecast_data(location_key):
     # Fetch next 12-hour hourly forecast from AccuWeather using location key
     ACCUWEATHER_API_KEY = os.getenv("ACCUWEATHER_API_KEY")
     if not ACCUWEATHER_API_KEY:
-        return "ACCUWEATHER_API_KEY is not set."
+        raise ApiError("ACCUWEATHER_API_KEY is not set.")
 
     hourly_forecast_params = {
         "apikey": ACCUWEATHER_API_KEY,
-        "details": True,
+        "details": False,
     }
 
     try:
-        hourly_forecast_response = requests.get(f"http://dataservice.accuweather.com/forecasts/v1/hourly/12hour/{location_key}", params=hourly_forecast_params)
-        hourly_forecast_data = hourly_forecast_response.json()
-
-        if isinstance(hourly_forecast_data, list) and len(hourly_forecast_data) >= 5:
-            # Extract and format the next 5 hourly forecast data for display
-            forecast_data_str = "Next 5-hour Hourly Forecast:\n"
-            for i in range(5):
-                data = hourly_forecast_data[i]
-                time_str = data.get("DateTime")
-                time = datetime.strptime(time_str, "%Y-%m-%dT%H:%M:%S%z")
-                hour_str = time.strftime("%H:%M")  # Extract hour part from time
-                temp = data.get("Temperature", {}).get("Value")
-                condition = data.get("IconPhrase")
-                forecast_data_str += f"{hour_str} - Temp: {temp}°F - Condition: {condition}\n"
-            return forecast_data_str
-        else:
-            return f"Hourly forecast data not available for {location_key}"
+        hourly_forecast_data = _get_json("hourly", f"{API_BASE_URLS['accuweather']}/forecasts/v1/hourly/12hour/{location_key}", params=hourly_forecast_params)
     except requests.exceptions.RequestException as e:
-        return f"Error fetching hourly forecast data for {location_key}: {e}"
+        raise ApiError(f"Error fetching hourly forecast data for {location_key}: {e}") from e
+
+    if isinstance(hourly_forecast_data, list) and len(hourly_forecast_data) >= 5:
+        return tuple(
+            _parse_hourly_point(data, "DateTime", data.get("Temperature", {}).get("Value"))
+            for data in hourly_forecast_data
+        )
+    else:
+        raise ApiError(f"Hourly forecast data not available for {location_key}")
+
+def fetch_conditions_bundle(location_key):
+    # Fetch every AccuWeather panel for one location at once. Identical requests already in
+    # flight (e.g. from an open resort screen) are shared rather than sent again. Each value is
+    # the panel's record, or the ApiError explaining why it is missing.
+    fetchers = {
+        "current": fetch_weather_data,
+        "daily": fetch_forecast_data,
+        "hourly": fetch_hourly_forecast_data,
+        "historical": fetch_historical_current_data,
+    }
+
+    # Worker threads don't inherit the caller's priority, so carry it over explicitly
+    low_priority = rate_limiter.in_low_priority()
+
+    def run(fetcher):
+        try:
+            if low_priority:
+                with rate_limiter.low_priority():
+                    return fetcher(location_key)
+            return fetcher(location_key)
+        except ApiError as e:
+            return e
+
+    futures = {name: _bundle_executor.submit(run, fetcher) for name, fetcher in fetchers.items()}
+    return {name: future.result() for name, future in futures.items()}
 
+@cache.cached("resort")
 def fetch_resort_data(resort_slug):
     if not resort_slug:
-        return None  # Resort slug is empty, return None
+        raise ApiError("No resort data source is configured.")
 
     # Fetch resort data from X Rapid Ski API using the given resort_slug
     X_RAPID_API_KEY = os.getenv("X_RAPID_API_KEY")
     if not X_RAPID_API_KEY:
-        return "X_RAPID_API_KEY is not set."
+        raise ApiError("X_RAPID_API_KEY is not set.")
 
     headers = {
         'X-RapidAPI-Key': X_RAPID_API_KEY,
         'X-RapidAPI-Host': 'ski-resorts-and-conditions.p.rapidapi.com'
     }
 
-    url = f'https://ski-resorts-and-conditions.p.rapidapi.com/v1/resort/{resort_slug}'
+    url = f"{API_BASE_URLS['rapidapi_ski']}/v1/resort/{resort_slug}"
 
     try:
-        response = requests.get(url, headers=headers)
-        resort_data = response.json()
-
-        if 'data' in resort_data:
-            return resort_data['data']
-        else:
-            return None  # Resort data not available
-    except requests.exceptions.RequestException:
-        return None  # Error fetching resort data
+        resort_data = _get_json("resort", url, headers=headers)
+    except requests.exceptions.RequestException as e:
+        raise ApiError(f"Error fetching resort data for {resort_slug}: {e}") from e
+
+    if 'data' in resort_data:
+        resort_data = resort_data['data']
+        lifts_status = resort_data.get('lifts', {}).get('status', {})
+        conditions = resort_data.get('conditions', {})
+        return LiftStatus(
+            lifts_open=tuple(lift for lift, status in lifts_status.items() if status == 'open'),
+            base=conditions.get('base', 0),
+            season_total=conditions.get('season', 0),
+        )
+    else:
+        raise ApiError(f"Resort data not available for {resort_slug}")
 
 def fetch_roadcam_images_from_api(roadcam_img_src_urls):
     try:
@@ -246,21 +341,48 @@ def fetch_roadcam_images_from_api(roadcam_img_src_urls):
         print(f"Error fetching roadcam images: {e}")
         return []  # Return empty list
 
-def fetch_user_tweets(twitter_handle):
-    url = "https://twitter135.p.rapidapi.com/v1.1/UserTimeline/"
+@cache.cached("tweets")
+def fetch_user_tweets(twitter_handle, count=3):
+    # The handle's newest count tweets, newest first, served from the local tweet store. The
+    # store is first topped up with only the tweets newer than the newest one it has (since_id),
+    # so a repeat visit costs an empty or tiny response. If that fails, stored tweets are shown
+    # (as a cache.StaleResult, so callers can tell).
+    error = _update_tweets(twitter_handle)
+    tweets = tweet_store.latest(twitter_handle, count)
+    if error is None:
+        return tweets
+    if tweets:
+        raise cache.StaleResult(tweets, error)
+    raise error
+
+
+def _update_tweets(twitter_handle):
+    # Store tweets newer than the newest stored one; returns the ApiError if they couldn't be fetched
+    url = f"{API_BASE_URLS['rapidapi_twitter']}/v1.1/UserTimeline/"
     headers = {
         "X-RapidAPI-Key": os.getenv("X_RAPID_API_KEY"),
         "X-RapidAPI-Host": "twitter135.p.rapidapi.com"
     }
     params = {
         "username": twitter_handle,  # Use the 'username' parameter instead of 'id'
-        "count": '3'  # Set the 'count' parameter to '1' as a string
+        "count": str(TWEET_FETCH_COUNT)
     }
+    since_id = tweet_store.newest_id(twitter_handle)
+    if since_id is not None:
+        params["since_id"] = str(since_id)
     try:
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return f"Error: {response.status_code} {response.text}"
+        timeline = _get_json("tweets", url, headers=headers, params=params)
     except requests.exceptions.RequestException as e:
-        return f"Error: {e}"
\ No newline at end of file
+        return _api_error(f"Error: {e}", e)
+
+    if not isinstance(timeline, list):
+        return ApiError(f"Unexpected timeline data for {twitter_handle}")
+    tweet_store.add(twitter_handle, _parse_timeline(timeline))
+    return None
+
+
+def _parse_timeline(timeline):
+    return [
+        Tweet(created_at=tweet.get('created_at'), text=tweet.get('text'), id=int(tweet.get('id_str') or tweet.get('id') or 0))
+        for tweet in timeline
+    ]
@@ -0,0 +1,37 @@
+# app/utils/assets.py
+from kivy.core.image import Image as CoreImage
+from kivy.core.text.markup import MarkupLabel
+
+# Images used by the menu, loaded once at startup and shared by every widget that shows them
+MENU_IMAGES = [
+    'app/images/pngwing.comcopy.png',
+    'app/images/pngwing.com.png',
+]
+
+_image_textures = {}
+_heading_textures = {}
+
+
+def get_image_texture(path):
+    texture = _image_textures.get(path)
+    if texture is None:
+        texture = CoreImage(path).texture
+        _image_textures[path] = texture
+    return texture
+
+
+def get_heading_texture(text, font_name, font_size):
+    # Render a markup heading once per (text, font, size in pixels) and share it across screens
+    key = (text, font_name, font_size)
+    texture = _heading_textures.get(key)
+    if texture is None:
+        label = MarkupLabel(text=text, font_name=font_name, font_size=font_size, halign='center')
+        label.refresh()
+        texture = label.texture
+        _heading_textures[key] = texture
+    return texture
+
+
+def preload_assets():
+    for path in MENU_IMAGES:
+        get_image_texture(path)
@@ -0,0 +1,199 @@
+# app/utils/cache.py
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app.config.config import CACHE_MAX_ENTRIES, CACHE_TTLS
+from app.utils.metrics import metrics
+from app.utils.ratelimit import LOW_PRIORITY, QuotaExceeded, rate_limiter
+
+
+class TTLCache:
+    # Size-bounded LRU map whose entries remember when they were stored
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        # Returns (value, age in seconds) or None when the key is not cached
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            value, stored_at = entry
+            return value, time.monotonic() - stored_at
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = TTLCache()
+
+# Background refreshes for entries served stale, at most one in flight per key
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+class StaleResult(Exception):
+    # Raised by a fetcher that could only answer with older data (for example from a local store)
+    # because the fresh fetch failed. It is not cached; get_or_fetch returns value and notes error.
+    def __init__(self, value, error):
+        super().__init__(str(error))
+        self.value = value
+        self.error = error
+
+
+# How old the last value get_or_fetch served on each thread was, and the error behind it if it
+# was a fallback, so a caller can tell cached or older data from live data (see take_served)
+_served = threading.local()
+
+
+def _note_served(age, error=None):
+    _served.age = age
+    _served.error = error
+
+
+def take_served():
+    # (age in seconds, fallback error or None) of the last value get_or_fetch served on this
+    # thread since the previous call, or (None, None) if it served none. The age of a fallback
+    # from a StaleResult is unknown (None).
+    served = getattr(_served, 'age', None), getattr(_served, 'error', None)
+    _note_served(None)
+    return served
+
+
+# Fetches currently running, so identical concurrent requests share one upstream call
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def _quota_exceeded(error):
+    # Fetchers wrap request errors in their own ApiError (chained with `from`), and fallbacks in
+    # StaleResult, so look through both for the rate limiter's QuotaExceeded
+    if isinstance(error, StaleResult):
+        error = error.error
+    return isinstance(error, QuotaExceeded) or isinstance(error.__cause__, QuotaExceeded)
+
+
+def _fetch_once(key, fetch):
+    priority = rate_limiter.priority_for(key[0])
+    while True:
+        with _in_flight_lock:
+            in_flight = _in_flight.get(key)
+            if in_flight is None:
+                future = Future()
+                _in_flight[key] = (future, priority)
+                break
+        future, owner_priority = in_flight
+        try:
+            return future.result()
+        except Exception as e:
+            # A low priority owner can run out of its share while a user-visible request
+            # still has budget left: try again rather than show the owner's error
+            if not _quota_exceeded(e) or owner_priority != LOW_PRIORITY or priority == LOW_PRIORITY:
+                raise
+
+    try:
+        value = fetch()
+        response_cache.set(key, value)
+        future.set_result(value)
+        return value
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+
+
+def _refresh(key, fetch, low_priority):
+    # Runs on the refresh pool, with the priority of the request that served the stale entry
+    try:
+        if low_priority:
+            with rate_limiter.low_priority():
+                _fetch_once(key, fetch)
+        else:
+            _fetch_once(key, fetch)
+    except Exception as e:
+        print(f"Error refreshing cached {key[0]} data: {e}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def _schedule_refresh(key, fetch):
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    _refresh_executor.submit(_refresh, key, fetch, rate_limiter.in_low_priority())
+
+
+def get_or_fetch(endpoint, key, fetch):
+    # Serve fresh entries directly, serve stale ones while refreshing in the background,
+    # and only block on fetch() when nothing usable is cached. Concurrent misses for the
+    # same key wait on a single fetch. Failed fetches are never cached; if one fails (for
+    # example because the API's daily budget is gone) an expired entry, or the older data a
+    # StaleResult carries, is better than nothing. What was served is noted for take_served.
+    key = (endpoint,) + tuple(key)
+    fresh_for, stale_for = CACHE_TTLS.get(endpoint, (0, 0))
+    cached = response_cache.get(key)
+    if cached is not None:
+        value, age = cached
+        if age < fresh_for:
+            metrics.record_cache(endpoint, 'hit')
+            _note_served(age)
+            return value
+        if age < fresh_for + stale_for:
+            metrics.record_cache(endpoint, 'stale')
+            _schedule_refresh(key, fetch)
+            _note_served(age)
+            return value
+
+    try:
+        value = _fetch_once(key, fetch)
+        metrics.record_cache(endpoint, 'miss')
+        _note_served(0)
+        return value
+    except Exception as e:
+        error = e.error if isinstance(e, StaleResult) else e
+        if cached is not None:
+            metrics.record_cache(endpoint, 'fallback')
+            _note_served(cached[1], error)
+            return cached[0]
+        if isinstance(e, StaleResult):
+            metrics.record_cache(endpoint, 'fallback')
+            _note_served(None, error)
+            return e.value
+        metrics.record_cache(endpoint, 'miss')
+        raise
+
+
+def cached(endpoint):
+    # Decorator: cache a fetcher's return value by its arguments under endpoint's TTLs. Arguments
+    # are bound to the signature with defaults filled in, so f(a), f(a, 24) and f(a, hours=24)
+    # share one entry.
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return get_or_fetch(endpoint, tuple(bound.arguments.values()), lambda: func(*bound.args, **bound.kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,94 @@
+# app/utils/formatting.py
+from datetime import datetime, timedelta
+
+# Display text for the records in app/utils/models.py
+
+
+def format_age(seconds):
+    # "just now", "12 min ago", "3 h ago", "2 days ago"
+    if seconds < 60:
+        return "just now"
+    if seconds < 60 * 60:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 24 * 60 * 60:
+        return f"{int(seconds // (60 * 60))} h ago"
+    days = int(seconds // (24 * 60 * 60))
+    return f"{days} day ago" if days == 1 else f"{days} days ago"
+
+
+def format_route_info(route_info):
+    # Calculate estimated arrival time from now, so a cached route still shows a current ETA
+    arrival_time = datetime.now() + timedelta(minutes=route_info.travel_time_minutes)
+    formatted_arrival_time = arrival_time.strftime("%I:%M %p")  # Format the arrival time as "HH:MM AM/PM"
+
+    traffic_info_str = f"Travel Time to {route_info.destination}: {route_info.travel_time_minutes} minutes\n"
+    traffic_info_str += f"Estimated Arrival Time: {formatted_arrival_time}\n"
+    traffic_info_str += f"Road Conditions: {route_info.congestion.capitalize()}\n"
+    traffic_info_str += f"Traffic Severity: {route_info.severity.capitalize()}\n"
+    if route_info.incidents:
+        traffic_info_str += "Traffic Incidents:\n"
+        for incident in route_info.incidents:
+            traffic_info_str += f"Incident Type: {incident.type}\n"
+            traffic_info_str += f"Description: {incident.description}\n"
+            traffic_info_str += f"Start Time: {incident.start}\n"
+            traffic_info_str += f"End Time: {incident.end}\n\n"
+    return traffic_info_str
+
+
+def format_historical_conditions(points, hours=12):
+    historical_current_data_str = "Historical Current Conditions (Past 24 Hours):\n"
+    for point in points[-hours:]:
+        formatted_time = point.time.strftime("%b %d %H:%M")  # Format: Month Day Hour:Minute
+        historical_current_data_str += f"{formatted_time} - Temp: {point.temperature}°F - Condition: {point.condition}\n"
+    return historical_current_data_str
+
+
+def format_current_conditions(conditions):
+    location_data = "Current Conditions\n"
+    location_data += f"Temperature: {conditions.temperature}°F\n"
+    location_data += f"Conditions: {conditions.condition}\n"
+    location_data += f"Humidity: {conditions.humidity}%\n"
+    location_data += f"Wind Speed: {conditions.wind_speed} mph\n"
+    location_data += f"Visibility: {conditions.visibility} miles\n"
+    return location_data
+
+
+def format_daily_forecast(forecast):
+    forecast_data_str = f"Temperature Min: {forecast.temperature_min}°F\n"
+    forecast_data_str += f"Temperature Max: {forecast.temperature_max}°F\n"
+    forecast_data_str += f"Day Conditions: {forecast.day_condition}\n"
+    return forecast_data_str
+
+
+def format_hourly_forecast(points, hours=5):
+    forecast_data_str = f"Next {hours}-hour Hourly Forecast:\n"
+    for point in points[:hours]:
+        hour_str = point.time.strftime("%H:%M")
+        forecast_data_str += f"{hour_str} - Temp: {point.temperature}°F - Condition: {point.condition}\n"
+    return forecast_data_str
+
+
+def format_lift_status(lift_status):
+    lifts_open_str = ', '.join(lift_status.lifts_open)
+    return f"Lifts Open: {lifts_open_str}\nConditions: Base {lift_status.base} cm, Season Total {lift_status.season_total} cm"
+
+
+def format_tweets(tweets, location, count=3):
+    if not tweets:
+        return f"No tweets available for {location}"
+    return "\n\n".join(f"Created at: {tweet.created_at}\nText: {tweet.text}" for tweet in tweets[:count])
+
+
+def format_comparison_cell(column, value, loading=False):
+    # One cell of the comparison table; value None means the resort has no data for the column
+    if loading:
+        return "..."
+    if value is None:
+        return "-"
+    if column == "drive_minutes":
+        return f"{value} min"
+    if column == "temperature":
+        return f"{value}°F"
+    if column == "base":
+        return f"{value} cm"
+    return str(value)
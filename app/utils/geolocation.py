@@ -1,6 +1,90 @@
-import geocoder
+import json
+import threading
+import time
+
+from app.config.config import LOCATION_TTL
+from app.utils.storage import data_path
+
+
+class LocationProvider:
+    # Resolves the user's location in the background, memoizes it for LOCATION_TTL seconds
+    # and remembers the last known position so the next launch can use it straight away
+    def __init__(self, ttl=LOCATION_TTL, filename='location.json'):
+        self.ttl = ttl
+        self.filename = filename
+        self._location = None
+        self._resolved_at = 0
+        self._lock = threading.Lock()
+        self._resolving = False
+        self._resolved = threading.Event()
+        self._load_last_known()
+
+    def _load_last_known(self):
+        try:
+            with open(data_path(self.filename)) as f:
+                saved = json.load(f)
+            self._location = saved["location"]
+            self._resolved_at = saved["resolved_at"]
+            self._resolved.set()
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _save_last_known(self):
+        try:
+            with open(data_path(self.filename), 'w') as f:
+                json.dump({"location": self._location, "resolved_at": self._resolved_at}, f)
+        except OSError as e:
+            print(f"Error saving last known location: {e}")
+
+    def resolve(self):
+        # Blocking IP lookup; keeps the previous location if the lookup fails. geocoder is
+        # imported here because it is slow to import and only needed once a lookup runs.
+        import geocoder
+        user_lat_lng = geocoder.ip('me').latlng
+        with self._lock:
+            if user_lat_lng:
+                self._location = '{},{}'.format(user_lat_lng[0], user_lat_lng[1])
+                self._resolved_at = time.time()
+                self._save_last_known()
+            self._resolving = False
+            self._resolved.set()
+            return self._location
+
+    def refresh_in_background(self):
+        with self._lock:
+            if self._resolving:
+                return
+            self._resolving = True
+        threading.Thread(target=self._resolve_quietly, name='geolocation', daemon=True).start()
+
+    def _resolve_quietly(self):
+        try:
+            self.resolve()
+        except Exception as e:
+            with self._lock:
+                self._resolving = False
+                self._resolved.set()
+            print(f"Error resolving user location: {e}")
+
+    def is_stale(self):
+        return time.time() - self._resolved_at >= self.ttl
+
+    def get_location(self, timeout=0):
+        # Non-blocking by default: returns the memoized location (possibly None) and kicks off a
+        # background refresh when it has expired. Pass a timeout to wait for a first answer.
+        if self.is_stale():
+            self.refresh_in_background()
+        if self._location is None and timeout:
+            self._resolved.wait(timeout)
+        return self._location
+
+
+location_provider = LocationProvider()
+
 
 def get_user_location():
-    user_lat_lng = geocoder.ip('me').latlng
-    user_lat_lng_string = '{},{}'.format(user_lat_lng[0], user_lat_lng[1])
-    return user_lat_lng_string
\ No newline at end of file
+    # Blocking accessor kept for simple callers: memoized location, or a fresh lookup if none is known
+    user_lat_lng_string = location_provider.get_location()
+    if user_lat_lng_string is None:
+        user_lat_lng_string = location_provider.resolve()
+    return user_lat_lng_string
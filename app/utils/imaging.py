@@ -0,0 +1,38 @@
+# app/utils/imaging.py
+import math
+from dataclasses import dataclass
+from io import BytesIO
+
+from PIL import Image as PilImage
+
+from app.config.config import ROADCAM_MAX_GIF_FRAMES, ROADCAM_MAX_SIZE, ROADCAM_MIN_FRAME_DELAY
+
+
+@dataclass(frozen=True)
+class DecodedImage:
+    # RGBA pixel buffers ready for Texture.blit_buffer, already flipped to Kivy's bottom-up order
+    size: tuple
+    frames: tuple
+    frame_delays: tuple  # Seconds each frame stays on screen
+
+
+def decode_image(image_data, max_size=ROADCAM_MAX_SIZE, max_frames=ROADCAM_MAX_GIF_FRAMES, min_frame_delay=ROADCAM_MIN_FRAME_DELAY):
+    # Decode JPEG/GIF bytes, downscale to fit max_size and thin animated GIFs to at most max_frames
+    with PilImage.open(BytesIO(image_data)) as image:
+        frame_count = getattr(image, 'n_frames', 1)
+        step = max(1, math.ceil(frame_count / max_frames))
+
+        frames = []
+        frame_delays = []
+        size = None
+        for index in range(0, frame_count, step):
+            image.seek(index)
+            frame_delay = image.info.get('duration', 100) / 1000 * step
+            frame = image.convert('RGBA')
+            frame.thumbnail(max_size, PilImage.Resampling.BILINEAR)
+            frame = frame.transpose(PilImage.Transpose.FLIP_TOP_BOTTOM)
+            size = frame.size
+            frames.append(frame.tobytes())
+            frame_delays.append(max(min_frame_delay, frame_delay))
+
+    return DecodedImage(size=size, frames=tuple(frames), frame_delays=tuple(frame_delays))
@@ -0,0 +1,120 @@
+# app/utils/metrics.py
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from app.config.config import METRICS_EXPORT_INTERVAL, METRICS_EXPORT_PATH
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Last bucket is +Inf
+        self.latency_sum = 0.0
+        self.requests = 0
+        self.bytes = 0
+        self.retries = 0
+        self.status_codes = defaultdict(int)
+        self.cache = defaultdict(int)  # hit / stale / miss / fallback
+
+    def latency_quantile(self, quantile):
+        # Upper bound of the bucket holding the quantile; good enough to spot the slow upstream
+        target = quantile * self.requests
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.latency_buckets):
+            seen += count
+            if seen >= target and count:
+                return bound
+        return 0.0
+
+
+class Metrics:
+    # Counters per endpoint (e.g. "current", "traffic", "roadcam"), shared by every thread
+    def __init__(self):
+        self._endpoints = defaultdict(EndpointMetrics)
+        self._lock = threading.Lock()
+
+    def record_request(self, endpoint, seconds, status, body_bytes=0, retries=0):
+        with self._lock:
+            metrics = self._endpoints[endpoint]
+            metrics.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            metrics.latency_sum += seconds
+            metrics.requests += 1
+            metrics.bytes += body_bytes
+            metrics.retries += retries
+            metrics.status_codes[str(status)] += 1
+
+    def record_cache(self, endpoint, outcome):
+        with self._lock:
+            self._endpoints[endpoint].cache[outcome] += 1
+
+    def summary(self):
+        # One row per endpoint for the debug overlay
+        with self._lock:
+            rows = []
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                lookups = sum(metrics.cache.values())
+                hits = metrics.cache['hit'] + metrics.cache['stale'] + metrics.cache['fallback']
+                errors = sum(count for status, count in metrics.status_codes.items() if not status.startswith(('2', '3')))
+                rows.append({
+                    "endpoint": endpoint,
+                    "requests": metrics.requests,
+                    "avg_ms": metrics.latency_sum / metrics.requests * 1000 if metrics.requests else 0,
+                    "p95_ms": metrics.latency_quantile(0.95) * 1000,
+                    "kb": metrics.bytes / 1024,
+                    "errors": errors,
+                    "retries": metrics.retries,
+                    "cache_hit_rate": hits / lookups if lookups else None,
+                })
+            return rows
+
+    def to_prometheus(self):
+        lines = [
+            "# TYPE resort_conditions_request_seconds histogram",
+            "# TYPE resort_conditions_response_bytes_total counter",
+            "# TYPE resort_conditions_responses_total counter",
+            "# TYPE resort_conditions_retries_total counter",
+            "# TYPE resort_conditions_cache_lookups_total counter",
+        ]
+        with self._lock:
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                label = f'endpoint="{endpoint}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), metrics.latency_buckets):
+                    cumulative += count
+                    lines.append(f'resort_conditions_request_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'resort_conditions_request_seconds_sum{{{label}}} {metrics.latency_sum:.6f}')
+                lines.append(f'resort_conditions_request_seconds_count{{{label}}} {metrics.requests}')
+                lines.append(f'resort_conditions_response_bytes_total{{{label}}} {metrics.bytes}')
+                for status, count in sorted(metrics.status_codes.items()):
+                    lines.append(f'resort_conditions_responses_total{{{label},status="{status}"}} {count}')
+                lines.append(f'resort_conditions_retries_total{{{label}}} {metrics.retries}')
+                for outcome, count in sorted(metrics.cache.items()):
+                    lines.append(f'resort_conditions_cache_lookups_total{{{label},outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path=METRICS_EXPORT_PATH):
+        # Write atomically so a scraper never reads a half-written file
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+    def start_exporter(self, path=METRICS_EXPORT_PATH, interval=METRICS_EXPORT_INTERVAL):
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.export(path)
+                except OSError as e:
+                    print(f"Error exporting metrics: {e}")
+
+        threading.Thread(target=run, name='metrics-exporter', daemon=True).start()
+
+
+metrics = Metrics()
@@ -0,0 +1,76 @@
+# app/utils/models.py
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+# Plain records returned by app/utils/api.py. They hold only what the app displays, compare by
+# value (so a refresh that changes nothing can be skipped) and are cheap to keep in the cache.
+# Turning them into text is app/utils/formatting.py's job.
+
+
+@dataclass(frozen=True, slots=True)
+class TrafficIncident:
+    type: str
+    description: str
+    start: str
+    end: str
+
+
+@dataclass(frozen=True, slots=True)
+class RouteInfo:
+    destination: str
+    travel_time_minutes: int
+    congestion: str
+    severity: str
+    incidents: Tuple[TrafficIncident, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class TravelTime:
+    resort: str
+    travel_time_minutes: int
+    distance_miles: float
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentConditions:
+    temperature: Optional[float]
+    condition: Optional[str]
+    humidity: Optional[float]
+    wind_speed: Optional[float]
+    visibility: Optional[float]
+
+
+@dataclass(frozen=True, slots=True)
+class DailyForecast:
+    temperature_min: Optional[float]
+    temperature_max: Optional[float]
+    day_condition: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class HourlyPoint:
+    # One hour of weather, either forecast or observed
+    time: datetime
+    temperature: Optional[float]
+    condition: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class LiftStatus:
+    lifts_open: Tuple[str, ...]
+    base: float
+    season_total: float
+
+
+@dataclass(frozen=True, slots=True)
+class Tweet:
+    created_at: str
+    text: str
+    id: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class RoadcamFrame:
+    url: str
+    image: object  # app.utils.imaging.DecodedImage
@@ -0,0 +1,157 @@
+# app/utils/prefetch.py
+import heapq
+import itertools
+import json
+import threading
+import time
+
+from app.config.config import (PREFETCH_IDLE_DELAY, PREFETCH_MAX_RESORTS_PER_HOUR, PREFETCH_MIN_INTERVAL,
+                               resorts)
+from app.utils.geolocation import location_provider
+from app.utils.storage import data_path
+
+
+def warm_resort_steps(location):
+    # The API calls a ResortScreen makes, as separate steps so a pause can stop between them,
+    # each with the upstream it calls and how many calls it makes at most. Results land in the
+    # shared response cache; roadcams are left to the screen itself.
+    # The fetch layer (requests and friends) is imported here, on the worker, rather than at startup.
+    from app.utils import api
+
+    resort_data = resorts[location]
+
+    def warm_traffic():
+        # Only the shared travel time matrix; the full route with incidents is left for the
+        # resort the user actually opens
+        user_location = location_provider.get_location()
+        if user_location is not None:
+            api.fetch_travel_times(user_location)
+
+    return [
+        ("accuweather", 4, lambda: api.fetch_conditions_bundle(resort_data["accuweather_key"])),
+        ("rapidapi_ski", 1, lambda: api.fetch_resort_data(resort_data["resort_slug"])),
+        ("bing", 1, warm_traffic),
+        ("rapidapi_twitter", 1, lambda: api.fetch_user_tweets(resort_data["twitter_handle"])),
+    ]
+
+
+class PrefetchScheduler:
+    # Warms resort data in the background while the menu is idle, most likely destination first.
+    # Priority is the resort's visit count plus boosts from hovering or pressing its button.
+    def __init__(self, filename='visits.json'):
+        self.filename = filename
+        self.visit_counts = self._load_visit_counts()
+        self._boosts = {}
+        self._queue = []
+        self._queued_priority = {}
+        self._counter = itertools.count()
+        self._last_warmed = {}
+        self._recent_warms = []
+        self._paused = True
+        self._resume_at = 0
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def _load_visit_counts(self):
+        try:
+            with open(data_path(self.filename)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_visit_counts(self):
+        try:
+            with open(data_path(self.filename), 'w') as f:
+                json.dump(self.visit_counts, f)
+        except OSError as e:
+            print(f"Error saving visit counts: {e}")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='prefetch', daemon=True)
+            self._thread.start()
+
+    def priority(self, location):
+        return self.visit_counts.get(location, 0) + self._boosts.get(location, 0)
+
+    def _push(self, location):
+        # Lazy updates: older heap entries for the same resort are skipped when popped
+        priority = self.priority(location)
+        self._queued_priority[location] = priority
+        heapq.heappush(self._queue, (-priority, next(self._counter), location))
+
+    def resume(self):
+        # The menu is showing: queue every resort and start once it has been idle a moment
+        with self._condition:
+            self._paused = False
+            self._resume_at = time.monotonic() + PREFETCH_IDLE_DELAY
+            for location in resorts:
+                self._push(location)
+            self._condition.notify()
+
+    def pause(self):
+        # The user navigated: drop queued work so it doesn't compete with the screen's own fetches
+        with self._condition:
+            self._paused = True
+            self._queue.clear()
+            self._queued_priority.clear()
+
+    def boost(self, location, amount):
+        with self._condition:
+            self._boosts[location] = self._boosts.get(location, 0) + amount
+            if not self._paused:
+                self._push(location)
+                self._condition.notify()
+
+    def record_visit(self, location):
+        with self._condition:
+            self.visit_counts[location] = self.visit_counts.get(location, 0) + 1
+            self._boosts.pop(location, None)
+        self._save_visit_counts()
+
+    def _can_warm(self, location, now):
+        if now - self._last_warmed.get(location, -PREFETCH_MIN_INTERVAL) < PREFETCH_MIN_INTERVAL:
+            return False
+        self._recent_warms = [warmed_at for warmed_at in self._recent_warms if now - warmed_at < 3600]
+        return len(self._recent_warms) < PREFETCH_MAX_RESORTS_PER_HOUR
+
+    def _next_location(self):
+        # Called with the condition held; blocks until there is something to warm
+        while True:
+            now = time.monotonic()
+            if self._paused or not self._queue:
+                self._condition.wait()
+            elif now < self._resume_at:
+                self._condition.wait(self._resume_at - now)
+            else:
+                neg_priority, _, location = heapq.heappop(self._queue)
+                if self._queued_priority.get(location) != -neg_priority:
+                    continue
+                del self._queued_priority[location]
+                if self._can_warm(location, now):
+                    self._last_warmed[location] = now
+                    self._recent_warms.append(now)
+                    return location
+
+    def _run(self):
+        from app.utils.ratelimit import rate_limiter
+
+        while True:
+            with self._condition:
+                location = self._next_location()
+            for upstream, calls, step in warm_resort_steps(location):
+                if self._paused:
+                    # Interrupted part way: allow this resort to be warmed again next time
+                    with self._condition:
+                        self._last_warmed.pop(location, None)
+                    break
+                if not rate_limiter.can_prefetch(upstream, calls):
+                    continue  # This API's prefetch share is spent for today
+                try:
+                    with rate_limiter.low_priority():
+                        step()
+                except Exception as e:
+                    print(f"Error prefetching data for {location}: {e}")
+
+
+prefetch_scheduler = PrefetchScheduler()
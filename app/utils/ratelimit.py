@@ -0,0 +1,170 @@
+# app/utils/ratelimit.py
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from urllib.parse import urlsplit
+
+import requests
+
+from app.config.config import (API_BASE_URLS, API_KEY_ENV, API_LIMITS, LOW_PRIORITY_ENDPOINTS, LOW_PRIORITY_RESERVE,
+                               PREFETCH_BUDGET_SHARE, UPSTREAM_OVERRIDE_URL)
+from app.utils.storage import data_path
+
+HIGH_PRIORITY = 'high'
+LOW_PRIORITY = 'low'
+
+# Upstream API for each host; hosts not listed (e.g. roadcam images) are not rate limited
+UPSTREAM_HOSTS = {urlsplit(base_url).netloc: upstream for upstream, base_url in API_BASE_URLS.items()}
+
+
+class QuotaExceeded(requests.exceptions.RequestException):
+    # Raised instead of sending a request the daily budget can't afford
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # Block until a token is available
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    # Token buckets and persisted daily budgets per (upstream, API key)
+    def __init__(self, limits=API_LIMITS, filename='quota.json'):
+        self.limits = limits
+        self.filename = filename
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._usage = self._load_usage()
+        self._usage_version = 0  # Bumped on every change to _usage
+        self._saved_version = 0
+        self._save_lock = threading.Lock()  # Held by the one thread writing the file
+
+    def _load_usage(self):
+        try:
+            with open(data_path(self.filename)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_usage(self):
+        # Called without self._lock held, so fetch threads don't queue behind the disk. Only one
+        # thread writes at a time, and it keeps writing until the newest usage is on disk; the
+        # others return straight away. Written to a temporary file and renamed into place, so a
+        # crash mid-write can't leave a truncated file that would reset today's counts.
+        if not self._save_lock.acquire(blocking=False):
+            return  # The thread saving now picks up this change too
+        try:
+            while True:
+                with self._lock:
+                    if self._saved_version == self._usage_version:
+                        self._save_lock.release()  # Under self._lock, so no change slips in unsaved
+                        return
+                    version = self._usage_version
+                    usage = json.dumps(self._usage)
+                path = data_path(self.filename)
+                with open(path + '.tmp', 'w') as f:
+                    f.write(usage)
+                os.replace(path + '.tmp', path)
+                self._saved_version = version
+        except OSError as e:
+            self._save_lock.release()
+            print(f"Error saving API usage: {e}")
+
+    @contextmanager
+    def low_priority(self):
+        # Everything requested from this thread inside the block is treated as low priority
+        previous = getattr(self._local, 'low_priority', False)
+        self._local.low_priority = True
+        try:
+            yield
+        finally:
+            self._local.low_priority = previous
+
+    def in_low_priority(self):
+        return getattr(self._local, 'low_priority', False)
+
+    def priority_for(self, endpoint):
+        if endpoint in LOW_PRIORITY_ENDPOINTS or self.in_low_priority():
+            return LOW_PRIORITY
+        return HIGH_PRIORITY
+
+    def used_today(self, upstream, api_key):
+        with self._lock:
+            usage = self._usage.get(self._usage_key(upstream, api_key))
+            if usage is None or usage["date"] != date.today().isoformat():
+                return 0
+            return usage["used"]
+
+    def remaining_today(self, upstream, api_key):
+        return self.limits[upstream]["daily"] - self.used_today(upstream, api_key)
+
+    def can_prefetch(self, upstream, calls):
+        # Background prefetch may only spend the first PREFETCH_BUDGET_SHARE of a day's budget,
+        # so an idle menu can't use up what the user needs later
+        if upstream not in self.limits or UPSTREAM_OVERRIDE_URL:
+            return True
+        used = self.used_today(upstream, os.getenv(API_KEY_ENV.get(upstream, ''), ''))
+        return used + calls <= int(self.limits[upstream]["daily"] * PREFETCH_BUDGET_SHARE)
+
+    def _usage_key(self, upstream, api_key):
+        key_id = hashlib.sha1((api_key or '').encode()).hexdigest()[:8]
+        return f"{upstream}:{key_id}"
+
+    def acquire(self, url, api_key, priority=HIGH_PRIORITY):
+        # Spend one request from the upstream's budget, waiting for the token bucket if needed.
+        # Raises QuotaExceeded when the day's budget (or, for low priority work, the share of it
+        # not held back for user-visible requests) is used up.
+        upstream = UPSTREAM_HOSTS.get(urlsplit(url).netloc)
+        if upstream is None or upstream not in self.limits or UPSTREAM_OVERRIDE_URL:
+            return  # Not a metered API, or requests are going to a local stand-in server
+        limits = self.limits[upstream]
+        usage_key = self._usage_key(upstream, api_key)
+
+        with self._lock:
+            today = date.today().isoformat()
+            usage = self._usage.get(usage_key)
+            if usage is None or usage["date"] != today:
+                usage = self._usage[usage_key] = {"date": today, "used": 0}
+
+            allowed = limits["daily"]
+            if priority == LOW_PRIORITY:
+                allowed = int(limits["daily"] * (1 - LOW_PRIORITY_RESERVE))
+            if usage["used"] >= limits["daily"]:
+                raise QuotaExceeded(f"{upstream} daily request budget used up ({usage['used']}/{limits['daily']})")
+            if usage["used"] >= allowed:
+                raise QuotaExceeded(f"{upstream} budget left today is reserved for on-screen requests ({usage['used']}/{limits['daily']})")
+
+            usage["used"] += 1
+            self._usage_version += 1
+
+            bucket = self._buckets.get(usage_key)
+            if bucket is None:
+                bucket = self._buckets[usage_key] = TokenBucket(limits["per_second"], limits["burst"])
+
+        self._save_usage()
+        bucket.acquire()
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,63 @@
+# app/utils/registry.py
+import threading
+
+from app.config.config import resorts
+
+
+class ResortRegistry:
+    # Indexed lookups over the resort catalog (app/config/resorts.json): by name, slug and
+    # region, plus the menu's search. Indexes are built once, on first use.
+    def __init__(self, catalog=resorts):
+        self.catalog = catalog
+        self._indexed = False
+        self._lock = threading.Lock()
+
+    def _ensure_indexes(self):
+        with self._lock:
+            if self._indexed:
+                return
+            self._by_name = {}
+            self._by_slug = {}
+            self._by_region = {}
+            self._search_text = {}
+            for name, resort_data in self.catalog.items():
+                region = resort_data.get("region", "")
+                self._by_name[name.casefold()] = name
+                if resort_data.get("resort_slug"):
+                    self._by_slug[resort_data["resort_slug"]] = name
+                self._by_region.setdefault(region, []).append(name)
+                self._search_text[name] = " ".join((name, resort_data.get("resort_slug", ""), region,
+                                                    resort_data.get("state", ""))).casefold()
+            self._indexed = True
+
+    def names(self):
+        return list(self.catalog)
+
+    def get(self, name):
+        # Resort data by name (any case), or None
+        self._ensure_indexes()
+        name = self._by_name.get(name.casefold())
+        return self.catalog[name] if name is not None else None
+
+    def name_for_slug(self, resort_slug):
+        self._ensure_indexes()
+        return self._by_slug.get(resort_slug)
+
+    def regions(self):
+        self._ensure_indexes()
+        return sorted(region for region in self._by_region if region)
+
+    def in_region(self, region):
+        self._ensure_indexes()
+        return list(self._by_region.get(region, []))
+
+    def search(self, query="", region=None):
+        # Names, in catalog order, in region (None for all) whose name, slug, region or state
+        # contains every word of query
+        self._ensure_indexes()
+        words = query.casefold().split()
+        names = self._by_region.get(region, []) if region else self.catalog
+        return [name for name in names if all(word in self._search_text[name] for word in words)]
+
+
+resort_registry = ResortRegistry()
@@ -0,0 +1,86 @@
+# app/utils/roadcams.py
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from app.config.config import ROADCAM_CACHE_MAX_CAMERAS, ROADCAM_MAX_SIZE, ROADCAM_WORKERS
+from app.utils import http_client
+from app.utils.cache import TTLCache
+from app.utils.imaging import decode_image
+from app.utils.models import RoadcamFrame
+
+_executor = ThreadPoolExecutor(max_workers=ROADCAM_WORKERS, thread_name_prefix='roadcam')
+# Decoding is CPU bound, so it gets its own pool sized to the machine rather than to the network
+_decode_executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix='roadcam-decode')
+
+# Last good download per camera URL: (ETag, Last-Modified, image bytes), used for conditional GETs.
+# Least recently used cameras are dropped beyond ROADCAM_CACHE_MAX_CAMERAS.
+_validators = TTLCache(max_entries=ROADCAM_CACHE_MAX_CAMERAS)
+
+
+def fetch_roadcam_image(img_src_url):
+    # Download one camera image, or confirm with a 304 that the copy we already have is current.
+    # Returns the image bytes, or None if the camera is unavailable.
+    cached = _validators.get(img_src_url)
+    if cached is not None:
+        cached = cached[0]
+
+    headers = {}
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    try:
+        response = http_client.get(img_src_url, 'roadcam', headers=headers, verify=False)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching roadcam image {img_src_url}: {e}")
+        return cached[2] if cached is not None else None
+
+    if response.status_code == 304 and cached is not None:
+        return cached[2]
+    if response.status_code != 200 or not response.content:
+        return None
+
+    _validators.set(img_src_url, (response.headers.get('ETag'), response.headers.get('Last-Modified'), response.content))
+    return response.content
+
+
+# Last decode per camera URL: (image bytes, max size, DecodedImage), reused while the bytes are
+# unchanged. Bounded like _validators, since an animated GIF decodes to tens of megabytes.
+_decoded = TTLCache(max_entries=ROADCAM_CACHE_MAX_CAMERAS)
+
+
+def decode_roadcam_image(img_src_url, image_data, max_size=ROADCAM_MAX_SIZE):
+    cached = _decoded.get(img_src_url)
+    if cached is not None:
+        cached = cached[0]
+    if cached is not None and cached[0] is image_data and cached[1] == max_size:
+        return cached[2]
+
+    try:
+        decoded = decode_image(image_data, max_size=max_size)
+    except Exception as e:
+        print(f"Error decoding roadcam image {img_src_url}: {e}")
+        return None
+
+    _decoded.set(img_src_url, (image_data, max_size, decoded))
+    return decoded
+
+
+def fetch_roadcam_images(roadcam_img_src_urls, max_size=ROADCAM_MAX_SIZE):
+    # Download every camera in parallel and decode each one as soon as it arrives. Returns a
+    # RoadcamFrame per camera that responded, in the configured order; unchanged cameras carry
+    # the same DecodedImage object as last time.
+    downloads = {_executor.submit(fetch_roadcam_image, img_src_url): img_src_url for img_src_url in roadcam_img_src_urls}
+    decodes = {}
+    for download in as_completed(downloads):
+        image_data = download.result()
+        if image_data:
+            img_src_url = downloads[download]
+            decodes[img_src_url] = _decode_executor.submit(decode_roadcam_image, img_src_url, image_data, max_size)
+    results = [(img_src_url, decodes[img_src_url].result()) for img_src_url in roadcam_img_src_urls if img_src_url in decodes]
+    return [RoadcamFrame(url=img_src_url, image=decoded) for img_src_url, decoded in results if decoded is not None]
@@ -0,0 +1,54 @@
+# app/utils/snapshots.py
+import pickle
+import time
+
+from app.utils.storage import SQLiteStore
+
+
+class SnapshotStore(SQLiteStore):
+    # Last successful record for every resort and panel, kept in SQLite so a resort screen can
+    # open showing what it had last time (marked with its age) while fresh data is fetched, and
+    # still has something to show when there is no connection at all
+    schema = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "CREATE TABLE IF NOT EXISTS snapshots ("
+        " resort TEXT NOT NULL,"
+        " panel TEXT NOT NULL,"
+        " saved_at REAL NOT NULL,"  # Unix time
+        " record BLOB NOT NULL,"  # Pickled record from app/utils/models.py
+        " PRIMARY KEY (resort, panel)"
+        ") WITHOUT ROWID",
+    )
+
+    def __init__(self, filename='snapshots.sqlite3'):
+        super().__init__(filename)
+
+    def load(self, resort):
+        # {panel: (record, age in seconds)} for one resort. Records that no longer unpickle (the
+        # models changed since they were saved) are skipped.
+        with self.connection() as connection:
+            rows = connection.execute(
+                "SELECT panel, saved_at, record FROM snapshots WHERE resort = ?", (resort,)).fetchall()
+        now = time.time()
+        snapshots = {}
+        for panel, saved_at, record in rows:
+            try:
+                snapshots[panel] = (pickle.loads(record), now - saved_at)
+            except Exception:
+                continue
+        return snapshots
+
+    def save(self, resort, panel, record, age=0):
+        # Store record as fetched age seconds ago. Only a record newer than the saved one replaces
+        # it, so the same cached response served again isn't rewritten on every visit.
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.connection() as connection, connection:
+            connection.execute(
+                "INSERT INTO snapshots VALUES (?, ?, ?, ?) ON CONFLICT (resort, panel) DO UPDATE"
+                " SET saved_at = excluded.saved_at, record = excluded.record"
+                " WHERE excluded.saved_at > snapshots.saved_at + 1",
+                (resort, panel, time.time() - age, data))
+
+
+snapshot_store = SnapshotStore()
@@ -0,0 +1,33 @@
+# app/utils/startup.py
+# Startup phase timings. main.py imports this first and marks each phase as it finishes; set
+# RESORT_CONDITIONS_STARTUP_PROFILE=1 to print the report once the first frame is on screen.
+# For a per-module breakdown of the import phase run `python -m tools.startup_profile`.
+import os
+import time
+
+PROFILE = os.getenv("RESORT_CONDITIONS_STARTUP_PROFILE", "") not in ("", "0")
+
+_started = time.perf_counter()
+_marks = []
+
+
+def mark(phase):
+    # Record that phase just finished
+    _marks.append((phase, time.perf_counter()))
+
+
+def phases():
+    # [(phase, seconds it took, seconds since startup)] in the order they finished
+    result = []
+    previous = _started
+    for phase, at in _marks:
+        result.append((phase, at - previous, at - _started))
+        previous = at
+    return result
+
+
+def report():
+    lines = [f"{'phase':<28}{'ms':>9}{'total ms':>10}"]
+    for phase, seconds, total in phases():
+        lines.append(f"{phase:<28}{seconds * 1000:>9.1f}{total * 1000:>10.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,35 @@
+# app/utils/storage.py
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from app.config.config import DATA_DIR
+
+
+def data_path(filename):
+    # Path to a file in the app's persistent data directory, creating the directory if needed
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
+
+
+class SQLiteStore:
+    # Base for the local SQLite stores: one connection per file in the data directory, shared by
+    # every thread behind a lock. It is opened on first use, so importing a store doesn't touch the
+    # disk; subclasses list the statements that set it up (pragmas, CREATE TABLE) in schema.
+    schema = ()
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        # The store's connection, held exclusively for the block
+        with self._lock:
+            if self._connection is None:
+                self._connection = sqlite3.connect(data_path(self.filename), check_same_thread=False)
+                for statement in self.schema:
+                    self._connection.execute(statement)
+            yield self._connection
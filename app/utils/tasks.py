@@ -0,0 +1,30 @@
+# app/utils/tasks.py
+from concurrent.futures import ThreadPoolExecutor
+from kivy.clock import Clock
+
+from app.config.config import COMPARE_WORKERS, FETCH_WORKERS
+
+# Shared pool for blocking network calls so the Kivy UI thread never waits on them
+executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='fetch')
+# Smaller pool for fan-outs over many resorts (the comparison screen), kept apart from the one
+# resort screens use so a long comparison never queues ahead of the screen being looked at
+fanout_executor = ThreadPoolExecutor(max_workers=COMPARE_WORKERS, thread_name_prefix='fanout')
+
+
+def run_in_background(func, callback, *args, on_error=None, executor=executor):
+    # Run func(*args) on the worker pool and hand the result to callback on the UI thread.
+    # If func raises, the exception goes to on_error on the UI thread instead (or is printed).
+    def on_done(future):
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error is None:
+                print(f"Error in background task {func.__name__}: {e}")
+            else:
+                Clock.schedule_once(lambda dt, error=e: on_error(error))
+            return
+        Clock.schedule_once(lambda dt: callback(result))
+
+    future = executor.submit(func, *args)
+    future.add_done_callback(on_done)
+    return future
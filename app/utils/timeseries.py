@@ -0,0 +1,65 @@
+# app/utils/timeseries.py
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.config.config import HISTORY_RETENTION_DAYS
+from app.utils.models import HourlyPoint
+from app.utils.storage import SQLiteStore
+
+
+class ObservationStore(SQLiteStore):
+    # Hourly observations per AccuWeather location, kept in SQLite so past conditions survive
+    # restarts, only hours not seen before have to be downloaded, and windows longer than the
+    # API's 24 hours can be answered locally
+    schema = (
+        "CREATE TABLE IF NOT EXISTS observations ("
+        " location_key TEXT NOT NULL,"
+        " observed_at INTEGER NOT NULL,"  # Unix time
+        " utc_offset INTEGER NOT NULL,"  # Seconds, to give back the station's local time
+        " temperature REAL,"
+        " condition TEXT,"
+        " PRIMARY KEY (location_key, observed_at)"
+        ") WITHOUT ROWID",
+    )
+
+    def __init__(self, filename='observations.sqlite3', retention_days=HISTORY_RETENTION_DAYS):
+        super().__init__(filename)
+        self.retention = retention_days * 24 * 60 * 60
+
+    def latest(self, location_key):
+        # Unix time of the newest stored observation, or None
+        with self.connection() as connection:
+            row = connection.execute(
+                "SELECT MAX(observed_at) FROM observations WHERE location_key = ?", (location_key,)).fetchone()
+        return row[0]
+
+    def add(self, location_key, points):
+        # Observations already stored are ignored; anything past the retention period is dropped
+        rows = [
+            (location_key, int(point.time.timestamp()), int((point.time.utcoffset() or timedelta(0)).total_seconds()),
+             point.temperature, point.condition)
+            for point in points
+        ]
+        with self.connection() as connection, connection:
+            connection.executemany("INSERT OR IGNORE INTO observations VALUES (?, ?, ?, ?, ?)", rows)
+            connection.execute("DELETE FROM observations WHERE location_key = ? AND observed_at < ?",
+                               (location_key, int(time.time() - self.retention)))
+
+    def window(self, location_key, hours):
+        # Observations from the last hours hours, oldest first
+        with self.connection() as connection:
+            rows = connection.execute(
+                "SELECT observed_at, utc_offset, temperature, condition FROM observations"
+                " WHERE location_key = ? AND observed_at >= ? ORDER BY observed_at",
+                (location_key, int(time.time() - hours * 60 * 60))).fetchall()
+        return tuple(
+            HourlyPoint(
+                time=datetime.fromtimestamp(observed_at, timezone(timedelta(seconds=utc_offset))),
+                temperature=temperature,
+                condition=condition,
+            )
+            for observed_at, utc_offset, temperature, condition in rows
+        )
+
+
+observation_store = ObservationStore()
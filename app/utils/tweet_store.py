@@ -0,0 +1,49 @@
+# app/utils/tweet_store.py
+from app.config.config import TWEET_STORE_MAX_PER_HANDLE
+from app.utils.models import Tweet
+from app.utils.storage import SQLiteStore
+
+
+class TweetStore(SQLiteStore):
+    # Tweets per Twitter handle, kept in SQLite so a poll only has to ask for tweets newer than
+    # the newest one seen, and the panel (or a longer feed) can be served without the network
+    schema = (
+        "CREATE TABLE IF NOT EXISTS tweets ("
+        " handle TEXT NOT NULL,"
+        " id INTEGER NOT NULL,"  # Tweet IDs grow over time, so they order tweets too
+        " created_at TEXT,"
+        " text TEXT,"
+        " PRIMARY KEY (handle, id)"
+        ") WITHOUT ROWID",
+    )
+
+    def __init__(self, filename='tweets.sqlite3', max_per_handle=TWEET_STORE_MAX_PER_HANDLE):
+        super().__init__(filename)
+        self.max_per_handle = max_per_handle
+
+    def newest_id(self, handle):
+        # ID of the newest stored tweet, or None
+        with self.connection() as connection:
+            row = connection.execute("SELECT MAX(id) FROM tweets WHERE handle = ?", (handle,)).fetchone()
+        return row[0]
+
+    def add(self, handle, tweets):
+        # Tweets already stored are ignored; only the newest max_per_handle are kept
+        with self.connection() as connection, connection:
+            connection.executemany("INSERT OR IGNORE INTO tweets VALUES (?, ?, ?, ?)",
+                                   [(handle, tweet.id, tweet.created_at, tweet.text) for tweet in tweets])
+            connection.execute(
+                "DELETE FROM tweets WHERE handle = ? AND id NOT IN"
+                " (SELECT id FROM tweets WHERE handle = ? ORDER BY id DESC LIMIT ?)",
+                (handle, handle, self.max_per_handle))
+
+    def latest(self, handle, count):
+        # The newest count tweets, newest first
+        with self.connection() as connection:
+            rows = connection.execute(
+                "SELECT id, created_at, text FROM tweets WHERE handle = ? ORDER BY id DESC LIMIT ?",
+                (handle, count)).fetchall()
+        return tuple(Tweet(created_at=created_at, text=text, id=tweet_id) for tweet_id, created_at, text in rows)
+
+
+tweet_store = TweetStore()
@@ -0,0 +1,19 @@
+from kivy.properties import NumericProperty, StringProperty
+from kivy.uix.image import Image
+
+from app.utils.assets import get_heading_texture
+
+
+class HeadingLabel(Image):
+    # Static markup heading drawn from the shared texture cache instead of rasterized per widget
+    text = StringProperty('')
+    font_name = StringProperty('Roboto')
+    font_size = NumericProperty('15sp')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bind(text=self.update_texture, font_name=self.update_texture, font_size=self.update_texture)
+        self.update_texture()
+
+    def update_texture(self, *args):
+        self.texture = get_heading_texture(self.text, self.font_name, self.font_size)
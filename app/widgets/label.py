@@ -1,10 +1,22 @@
+from kivy.clock import Clock
 from kivy.uix.label import Label
 
 class CustomLabel(Label):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        # Width changes during a resize are coalesced into one re-wrap per frame
+        self._trigger_text_width = Clock.create_trigger(self.apply_text_width)
         self.bind(width=self.update_text_width)
 
     def update_text_width(self, instance, width):
-        self.text_size = (width, None)
-        self.texture_update()
\ No newline at end of file
+        self._trigger_text_width()
+
+    def apply_text_width(self, *args):
+        # Label re-renders its texture on its own (also once per frame) when text_size changes,
+        # so only touch text_size when the wrap width really moved
+        if self.text_size[0] != self.width:
+            self.text_size = (self.width, None)
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
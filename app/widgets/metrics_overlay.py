@@ -0,0 +1,56 @@
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.uix.label import Label
+
+from app.utils.metrics import metrics
+
+
+class MetricsOverlay(Label):
+    # Semi-transparent per-endpoint request/cache table drawn over whatever screen is showing
+    def __init__(self, **kwargs):
+        super().__init__(font_name='RobotoMono-Regular', font_size='13sp', halign='left', valign='top',
+                         size_hint=(None, None), padding=(10, 10), **kwargs)
+        with self.canvas.before:
+            Color(0, 0, 0, 0.75)
+            self.background = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self.update_background, size=self.update_background, texture_size=self.update_size)
+        self._refresh_event = None
+
+    def update_background(self, *args):
+        self.background.pos = self.pos
+        self.background.size = self.size
+
+    def update_size(self, instance, texture_size):
+        self.size = texture_size
+        self.pos = (10, Window.height - self.height - 10)
+
+    def refresh(self, *args):
+        rows = [f"{'endpoint':<34}{'reqs':>6}{'avg ms':>8}{'p95 ms':>8}{'KB':>9}{'errs':>6}{'retry':>6}{'cache':>7}"]
+        for row in metrics.summary():
+            hit_rate = f"{row['cache_hit_rate']:.0%}" if row['cache_hit_rate'] is not None else '-'
+            rows.append(f"{row['endpoint'][:33]:<34}{row['requests']:>6}{row['avg_ms']:>8.0f}{row['p95_ms']:>8.0f}"
+                        f"{row['kb']:>9.1f}{row['errors']:>6}{row['retries']:>6}{hit_rate:>7}")
+        self.text = "\n".join(rows)
+
+    def show(self):
+        self.refresh()
+        Window.add_widget(self)
+        self._refresh_event = Clock.schedule_interval(self.refresh, 1)
+
+    def hide(self):
+        self._refresh_event.cancel()
+        Window.remove_widget(self)
+
+
+_overlay = None
+
+
+def toggle_metrics_overlay(*args):
+    global _overlay
+    if _overlay is None:
+        _overlay = MetricsOverlay()
+    if _overlay.parent is None:
+        _overlay.show()
+    else:
+        _overlay.hide()
@@ -0,0 +1,45 @@
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+from kivy.uix.image import Image
+
+
+class RoadcamImage(Image):
+    # Shows a roadcam image decoded off the UI thread (see app/utils/imaging.py), animating GIF frames
+    def __init__(self, img_src_url, decoded_image, **kwargs):
+        super().__init__(**kwargs)
+        self.img_src_url = img_src_url
+        self.decoded_image = None
+        self._textures = []
+        self._frame_index = 0
+        self._frame_event = None
+        self.set_decoded_image(decoded_image)
+
+    def set_decoded_image(self, decoded_image):
+        if decoded_image is self.decoded_image:
+            return  # Unchanged since the last refresh (the server answered 304)
+        self.release()
+        self.decoded_image = decoded_image
+        for frame in decoded_image.frames:
+            texture = Texture.create(size=decoded_image.size, colorfmt='rgba')
+            texture.blit_buffer(frame, colorfmt='rgba', bufferfmt='ubyte')
+            self._textures.append(texture)
+        self._frame_index = 0
+        self.texture = self._textures[0]
+        self._schedule_next_frame()
+
+    def _schedule_next_frame(self):
+        if len(self._textures) > 1:
+            delay = self.decoded_image.frame_delays[self._frame_index]
+            self._frame_event = Clock.schedule_once(self._show_next_frame, delay)
+
+    def _show_next_frame(self, dt):
+        self._frame_index = (self._frame_index + 1) % len(self._textures)
+        self.texture = self._textures[self._frame_index]
+        self._schedule_next_frame()
+
+    def release(self):
+        # Stop GIF animation and drop the textures so their GPU memory can be freed
+        if self._frame_event is not None:
+            self._frame_event.cancel()
+            self._frame_event = None
+        self._textures = []
@@ -0,0 +1,119 @@
+# headless.py
+# Fetch every resort in app/config/config.py without the GUI and write a JSON (or NDJSON) snapshot
+# with per-endpoint timings. Nothing here imports Kivy, so it runs on a server without a display:
+#
+#     python headless.py --output snapshot.json
+#     python headless.py --format ndjson --roadcams > snapshot.ndjson
+import argparse
+import dataclasses
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+from app.config.config import FETCH_WORKERS, resorts
+from app.utils import api, roadcams
+from app.utils.geolocation import location_provider
+from app.utils.metrics import metrics
+
+
+def to_json(value):
+    # Records become plain dicts; exceptions become their message
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    if isinstance(value, tuple):
+        return [to_json(item) for item in value]
+    return value
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    try:
+        result = {"ok": True, "data": to_json(func(*args))}
+    except Exception as e:
+        result = {"ok": False, "error": str(e)}
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def fetch_roadcam_sizes(roadcam_img_src_urls):
+    # Download the cameras (conditional GETs included) but skip decoding; report bytes per camera
+    sizes = {}
+    for img_src_url in roadcam_img_src_urls:
+        image_data = roadcams.fetch_roadcam_image(img_src_url)
+        sizes[img_src_url] = len(image_data) if image_data else None
+    return sizes
+
+
+def resort_jobs(location, resort_data, user_location, include_roadcams):
+    jobs = {
+        "current": (api.fetch_weather_data, resort_data["accuweather_key"]),
+        "daily": (api.fetch_forecast_data, resort_data["accuweather_key"]),
+        "hourly": (api.fetch_hourly_forecast_data, resort_data["accuweather_key"]),
+        "historical": (api.fetch_historical_current_data, resort_data["accuweather_key"]),
+        "resort": (api.fetch_resort_data, resort_data["resort_slug"]),
+        "tweets": (api.fetch_user_tweets, resort_data["twitter_handle"]),
+    }
+    if user_location is not None:
+        jobs["traffic"] = (api.fetch_traffic_info, user_location, resort_data["location"])
+    if include_roadcams:
+        jobs["roadcams"] = (fetch_roadcam_sizes, resort_data.get("roadcam_img_src_urls", []))
+    return jobs
+
+
+def fetch_snapshot(locations, include_roadcams=False, workers=FETCH_WORKERS, user_location=None):
+    # Every endpoint of every resort runs concurrently; returns one dict per resort
+    if user_location is None:
+        user_location = location_provider.get_location(timeout=10)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            location: {
+                endpoint: executor.submit(timed, *job)
+                for endpoint, job in resort_jobs(location, resorts[location], user_location, include_roadcams).items()
+            }
+            for location in locations
+        }
+        snapshot = [
+            {"resort": location, "endpoints": {endpoint: future.result() for endpoint, future in endpoint_futures.items()}}
+            for location, endpoint_futures in futures.items()
+        ]
+    return snapshot, round(time.perf_counter() - started, 4)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch all resort data without the GUI and write a JSON snapshot.")
+    parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+    parser.add_argument("--resort", action="append", choices=list(resorts), help="Only fetch this resort (repeatable)")
+    parser.add_argument("--roadcams", action="store_true", help="Also download roadcam images and report their sizes")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--user-location", help="Origin for traffic as 'lat,lng' (default: IP lookup)")
+    parser.add_argument("--metrics", help="Also write per-endpoint request metrics to this file (Prometheus text format)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    snapshot, total_seconds = fetch_snapshot(args.resort or list(resorts), args.roadcams, args.workers, args.user_location)
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    if args.metrics:
+        metrics.export(args.metrics)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.format == "ndjson":
+            for entry in snapshot:
+                output.write(json.dumps({"fetched_at": fetched_at, **entry}, default=str) + "\n")
+        else:
+            json.dump({"fetched_at": fetched_at, "total_seconds": total_seconds, "resorts": snapshot}, output, default=str, indent=2)
+            output.write("\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
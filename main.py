@@ -1,13 +1,21 @@
+from app.utils import startup  # First, so the startup clock includes every other import
+from collections import OrderedDict
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.screenmanager import Screen, ScreenManager
 from kivy.core.window import Window
 from kivy.core.text import LabelBase
 from dotenv import load_dotenv
-from app.utils import api
-from app.config.config import resorts
-from app.utils.geolocation import get_user_location
-from app.screens.resort_screen import ResortScreen
+from app.utils.assets import preload_assets
+from app.utils.prefetch import prefetch_scheduler
+from app.config.config import MAX_LIVE_RESORT_SCREENS, resorts
+from app.utils.geolocation import location_provider
+from app.utils.metrics import metrics
 from app.screens.main_menu_screen import MainMenuScreen
+from app.widgets.metrics_overlay import toggle_metrics_overlay
+# ResortScreen (and with it requests, Pillow and the fetch layer) is imported on the first resort visit
+
+startup.mark("imports")
 
 # Load environment variables from .env
 load_dotenv()
@@ -20,34 +28,107 @@ class SkiResortWeatherApp(App):
         LabelBase.register(name='DrippyFont', fn_regular='app/fonts/Meltdownmf-OEyd.ttf')
         LabelBase.register(name='GoreFont', fn_regular='app/fonts/GorefontIi-2vAw.ttf')
 
+        # Load shared menu textures once, before any screen asks for them
+        preload_assets()
+
         # Add the main menu screen
         main_menu_screen = Screen(name='Main Menu')
-        main_menu_screen.add_widget(MainMenuScreen())
+        self.main_menu = MainMenuScreen()
+        main_menu_screen.add_widget(self.main_menu)
         self.screen_manager.add_widget(main_menu_screen)
+        # Bound after add_widget, which enters the first screen straight away: on launch this work
+        # waits for the first frame (start_background_work), these handlers cover later returns
+        # Only decode the background video while the menu is on screen
+        main_menu_screen.bind(on_pre_enter=self.main_menu.start_background_video, on_leave=self.main_menu.stop_background_video)
+        # Warm resort data in the background only while the menu is idle
+        main_menu_screen.bind(on_enter=lambda screen: prefetch_scheduler.resume(), on_leave=lambda screen: prefetch_scheduler.pause())
+        # Drive times on the resort buttons, refreshed whenever the menu comes back
+        main_menu_screen.bind(on_enter=self.main_menu.refresh_travel_times)
 
-        # Add resort-specific screens
-        for location, resort_data in resorts.items():
-            roadcam_img_src_urls = resort_data.get("roadcam_img_src_urls", [])
-            resort_screen = Screen(name=location)
-            twitter_api_user_id = resort_data.get("twitter_api_user_id")  # Get the twitter_api_user_id from the resort_data
-            resort_screen.add_widget(ResortScreen(location, resort_data["twitter_handle"], twitter_api_user_id=twitter_api_user_id, roadcam_img_src_urls=roadcam_img_src_urls))
-            self.screen_manager.add_widget(resort_screen)
+        # Resort screens are built on first visit by get_resort_screen, the comparison screen by get_comparison_screen
+        self.resort_screens = OrderedDict()
+        self.comparison_screen = None
 
         self.adjust_root_width(self.screen_manager, 800)  # Call the adjust_root_width method with the desired width
 
         # Set the title of the app window
         self.title = 'Resort Conditions'  # Change the title here
 
+        startup.mark("build")
         return self.screen_manager
     
+    def get_resort_screen(self, location):
+        # Return the ResortScreen for location, building it on first use and freeing the
+        # least recently used screens beyond MAX_LIVE_RESORT_SCREENS
+        if location in self.resort_screens:
+            self.resort_screens.move_to_end(location)
+            return self.resort_screens[location].children[0]
+
+        from app.screens.resort_screen import ResortScreen
+
+        resort_data = resorts[location]
+        roadcam_img_src_urls = resort_data.get("roadcam_img_src_urls", [])
+        twitter_api_user_id = resort_data.get("twitter_api_user_id")  # Get the twitter_api_user_id from the resort_data
+        resort_screen = Screen(name=location)
+        resort_screen.add_widget(ResortScreen(location, resort_data["twitter_handle"], twitter_api_user_id=twitter_api_user_id, roadcam_img_src_urls=roadcam_img_src_urls))
+        self.screen_manager.add_widget(resort_screen)
+        self.resort_screens[location] = resort_screen
+
+        while len(self.resort_screens) > MAX_LIVE_RESORT_SCREENS:
+            evicted_location = next(iter(self.resort_screens))
+            if evicted_location == self.screen_manager.current:
+                break
+            evicted_screen = self.resort_screens.pop(evicted_location)
+            evicted_screen.children[0].release()
+            self.screen_manager.remove_widget(evicted_screen)
+
+        return resort_screen.children[0]
+
+    def get_comparison_screen(self):
+        if self.comparison_screen is None:
+            from app.screens.comparison_screen import ComparisonScreen
+
+            screen = Screen(name='Compare')
+            self.comparison_screen = ComparisonScreen()
+            screen.add_widget(self.comparison_screen)
+            self.screen_manager.add_widget(screen)
+        return self.comparison_screen
+
     def adjust_root_width(self, instance, width):
         instance.width = width
 
     def on_start(self):
         Window.maximize()
+        Window.bind(on_key_down=self.on_key_down)
+        Window.bind(on_flip=self.on_first_frame)
+        startup.mark("start")
+
+    def on_first_frame(self, *args):
+        # The menu is on screen; only now start the background work that competes with drawing it
+        Window.unbind(on_flip=self.on_first_frame)
+        startup.mark("first frame")
+        Clock.schedule_once(self.start_background_work, 0)
+
+    def start_background_work(self, dt):
+        if self.screen_manager.current == 'Main Menu':
+            self.main_menu.start_background_video()
+        # Resolve the user's location in the background; the last known position is used meanwhile
+        location_provider.get_location()
+        self.main_menu.refresh_travel_times()
+        prefetch_scheduler.start()
+        prefetch_scheduler.resume()
+        # Keep a Prometheus text file of request metrics up to date for node_exporter and friends
+        metrics.start_exporter()
+        startup.mark("background work started")
+        if startup.PROFILE:
+            print(startup.report())
+
+    def on_key_down(self, window, key, scancode, codepoint, modifiers):
+        if key == 293:  # F12
+            toggle_metrics_overlay()
+            return True
     
 
 if __name__ == '__main__':
-    user_lat_lng_string = get_user_location()
     app = SkiResortWeatherApp()
     app.run()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Keep the app's persistent files (quota, stores) out of the user's data directory
+os.environ.setdefault("RESORT_CONDITIONS_DATA_DIR", tempfile.mkdtemp(prefix='resort-conditions-test-'))
+
+from app.utils import api, cache, http_client  # noqa: E402
+from app.utils.ratelimit import LOW_PRIORITY, QuotaExceeded, rate_limiter  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class SharedFetchTests(unittest.TestCase):
+    def setUp(self):
+        cache.response_cache.clear()
+        self.addCleanup(cache.response_cache.clear)
+
+    def test_high_priority_waiter_retries_after_low_priority_owner_runs_out_of_quota(self):
+        # A prefetch (low priority) owns the in-flight fetch and is refused by the rate limiter
+        # while an on-screen request (high priority) for the same key waits on it
+        owner_started = threading.Event()
+        waiter_joined = threading.Event()
+
+        def acquire(url, api_key, priority):
+            if priority == LOW_PRIORITY:
+                owner_started.set()
+                waiter_joined.wait(5)
+                time.sleep(0.2)  # Let the waiter block on the owner's future
+                raise QuotaExceeded("accuweather budget left today is reserved for on-screen requests")
+
+        def get(url, endpoint=None, **kwargs):
+            return FakeResponse([{"Temperature": {"Imperial": {"Value": 20}}, "WeatherText": "Light snow"}])
+
+        owner_errors = []
+
+        def prefetch():
+            with rate_limiter.low_priority():
+                try:
+                    api.fetch_weather_data('X')
+                except api.ApiError as e:
+                    owner_errors.append(e)
+
+        real_fetch_once = cache._fetch_once
+
+        def fetch_once(key, fetch):
+            if threading.current_thread() is not owner:
+                waiter_joined.set()
+            return real_fetch_once(key, fetch)
+
+        with mock.patch.dict(os.environ, {"ACCUWEATHER_API_KEY": "test"}), \
+                mock.patch.object(rate_limiter, 'acquire', acquire), \
+                mock.patch.object(http_client, 'get', get), \
+                mock.patch.object(cache, '_fetch_once', fetch_once):
+            owner = threading.Thread(target=prefetch)
+            owner.start()
+            self.assertTrue(owner_started.wait(5))
+            conditions = api.fetch_weather_data('X')
+            owner.join(5)
+
+        self.assertEqual(conditions.condition, "Light snow")
+        self.assertEqual(len(owner_errors), 1)
+        self.assertIsInstance(owner_errors[0].__cause__, QuotaExceeded)
+
+    def test_low_priority_waiter_gets_the_owners_quota_error(self):
+        with rate_limiter.low_priority():
+            error = api.ApiError("low share used")
+            error.__cause__ = QuotaExceeded("low share used")
+            key = ('current', 'Y')
+            future = cache.Future()
+            future.set_exception(error)
+            cache._in_flight[key] = (future, LOW_PRIORITY)
+            try:
+                with self.assertRaises(api.ApiError):
+                    cache._fetch_once(key, lambda: self.fail("low priority waiters don't retry"))
+            finally:
+                del cache._in_flight[key]
+
+
+if __name__ == '__main__':
+    unittest.main()
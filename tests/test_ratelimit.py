@@ -0,0 +1,33 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+# Keep the app's persistent files (quota, stores) out of the user's data directory
+os.environ.setdefault("RESORT_CONDITIONS_DATA_DIR", tempfile.mkdtemp(prefix='resort-conditions-test-'))
+
+from app.utils.ratelimit import RateLimiter  # noqa: E402
+from app.utils.storage import data_path  # noqa: E402
+
+LIMITS = {"accuweather": {"per_second": 1e6, "burst": 1e6, "daily": 10 ** 6}}
+URL = 'http://dataservice.accuweather.com/currentconditions/v1/X'
+
+
+class UsagePersistenceTests(unittest.TestCase):
+    def test_concurrent_requests_are_all_saved(self):
+        limiter = RateLimiter(limits=LIMITS, filename='test-quota.json')
+        threads = [threading.Thread(target=lambda: [limiter.acquire(URL, 'test') for _ in range(100)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with open(data_path('test-quota.json')) as f:
+            self.assertEqual(sum(usage["used"] for usage in json.load(f).values()), 800)
+        self.assertFalse(os.path.exists(data_path('test-quota.json.tmp')))
+        self.assertEqual(RateLimiter(limits=LIMITS, filename='test-quota.json').used_today('accuweather', 'test'), 800)
+
+
+if __name__ == '__main__':
+    unittest.main()
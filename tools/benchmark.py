@@ -0,0 +1,279 @@
+# tools/benchmark.py
+# Benchmarks against the local replay server (tools/replay_server.py) with synthetic data and
+# controlled latency, so numbers are comparable between versions and need no network or API quota:
+#
+#     python -m tools.benchmark                                  # writes bench_results/<time>.json
+#     python -m tools.benchmark --latency 150 --jitter 50 --compare bench_results/previous.json
+#
+# Reports cold/warm startup to first frame, time-to-first-panel and time-to-all-panels per resort
+# (cold and warm cache), bytes downloaded, peak RSS, and microbenchmarks of the parsing and
+# formatting paths in app/utils/api.py. Each measurement runs in a fresh subprocess.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS_DIR = os.path.join(REPO_ROOT, 'bench_results')
+
+# Dummy keys: the replay server ignores them, but the fetchers refuse to run without them
+BENCH_ENV = {"ACCUWEATHER_API_KEY": "bench", "BING_MAPS_API_KEY": "bench", "X_RAPID_API_KEY": "bench"}
+BENCH_USER_LOCATION = "40.7608,-111.8910"
+
+
+def peak_rss_kb():
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def server_stats(upstream):
+    return requests.get(f"{upstream}/__stats", timeout=5).json()
+
+
+def panel_jobs(location):
+    # The same eight fetches a ResortScreen starts when it opens
+    from app.config.config import ROADCAM_MAX_SIZE, resorts
+    from app.utils import api, roadcams
+
+    resort_data = resorts[location]
+    key = resort_data["accuweather_key"]
+    return {
+        "traffic": (api.fetch_traffic_info, BENCH_USER_LOCATION, resort_data["location"]),
+        "historical": (api.fetch_historical_current_data, key),
+        "weather": (api.fetch_weather_data, key),
+        "forecast": (api.fetch_forecast_data, key),
+        "hourly": (api.fetch_hourly_forecast_data, key),
+        "resort": (api.fetch_resort_data, resort_data["resort_slug"]),
+        "roadcams": (roadcams.fetch_roadcam_images, resort_data.get("roadcam_img_src_urls", []), ROADCAM_MAX_SIZE),
+        "tweets": (api.fetch_user_tweets, resort_data["twitter_handle"]),
+    }
+
+
+def load_screen_data(location, upstream):
+    from app.config.config import FETCH_WORKERS
+
+    stats_before = server_stats(upstream)
+    started = time.perf_counter()
+    panels = {}
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        futures = {executor.submit(func, *args): panel for panel, (func, *args) in panel_jobs(location).items()}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                ok = True
+            except Exception:
+                ok = False
+            panels[futures[future]] = {"seconds": round(time.perf_counter() - started, 4), "ok": ok}
+    stats_after = server_stats(upstream)
+    return {
+        "time_to_first_panel": min(panel["seconds"] for panel in panels.values()),
+        "time_to_all_panels": max(panel["seconds"] for panel in panels.values()),
+        "requests": stats_after["requests"] - stats_before["requests"],
+        "bytes_downloaded": stats_after["bytes"] - stats_before["bytes"],
+        "panels": panels,
+    }
+
+
+def resort_worker(location, upstream):
+    import_started = time.perf_counter()
+    from app.utils import api, roadcams  # noqa: F401  (timed import of the fetch layer)
+    import_seconds = time.perf_counter() - import_started
+
+    cold = load_screen_data(location, upstream)
+    warm = load_screen_data(location, upstream)  # Same process: response cache and roadcam validators are warm
+    return {"import_seconds": round(import_seconds, 4), "cold": cold, "warm": warm, "peak_rss_kb": peak_rss_kb()}
+
+
+def micro_worker(upstream, number):
+    from app.config.config import resorts
+    from app.utils import api, formatting
+
+    key = next(iter(resorts.values()))["accuweather_key"]
+    slug = next(resort["resort_slug"] for resort in resorts.values() if resort["resort_slug"])
+    handle = next(iter(resorts.values()))["twitter_handle"]
+    fetchers = {
+        "traffic": (api.fetch_traffic_info, BENCH_USER_LOCATION, next(iter(resorts.values()))["location"]),
+        "historical": (api.fetch_historical_current_data, key),
+        "weather": (api.fetch_weather_data, key),
+        "forecast": (api.fetch_forecast_data, key),
+        "hourly": (api.fetch_hourly_forecast_data, key),
+        "resort": (api.fetch_resort_data, slug),
+        "tweets": (api.fetch_user_tweets, handle),
+    }
+
+    # Capture each endpoint's JSON once, then time only parsing by replaying it without HTTP or cache
+    captured = {}
+    real_get_json = api._get_json
+
+    def capture(endpoint, *args, **kwargs):
+        captured[endpoint] = real_get_json(endpoint, *args, **kwargs)
+        return captured[endpoint]
+
+    api._get_json = capture
+    records = {name: func.__wrapped__(*args) for name, (func, *args) in fetchers.items()}
+    api._get_json = lambda endpoint, *args, **kwargs: captured[endpoint]
+
+    formatters = {
+        "traffic": formatting.format_route_info,
+        "historical": formatting.format_historical_conditions,
+        "weather": formatting.format_current_conditions,
+        "forecast": formatting.format_daily_forecast,
+        "hourly": formatting.format_hourly_forecast,
+        "resort": formatting.format_lift_status,
+        "tweets": lambda tweets: formatting.format_tweets(tweets, "Benchmark"),
+    }
+    # Past conditions and tweets are served from local stores once fetched, so time parsing their
+    # captured JSON directly rather than a store round trip
+    parsers = {name: (lambda func=func, args=args: func.__wrapped__(*args)) for name, (func, *args) in fetchers.items()}
+    parsers["historical"] = lambda: api._parse_observations(captured["historical"])
+    parsers["tweets"] = lambda: api._parse_timeline(captured["tweets"])
+
+    results = {}
+    for name, parse in parsers.items():
+        parse_seconds = timeit.timeit(parse, number=number) / number
+        format_seconds = timeit.timeit(lambda: formatters[name](records[name]), number=number) / number
+        results[name] = {"parse_us": round(parse_seconds * 1e6, 2), "format_us": round(format_seconds * 1e6, 2)}
+    return results
+
+
+def startup_worker():
+    # Time from interpreter start to the first frame the window draws, then quit
+    process_started = float(os.environ["BENCH_PROCESS_STARTED"])
+    import_started = time.perf_counter()
+    import main
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    import_seconds = time.perf_counter() - import_started
+
+    result = {"import_seconds": round(import_seconds, 4)}
+    app = main.SkiResortWeatherApp()
+    original_build = app.build
+
+    def timed_build():
+        build_started = time.perf_counter()
+        root = original_build()
+        result["build_seconds"] = round(time.perf_counter() - build_started, 4)
+        return root
+
+    def on_first_frame(*args):
+        Window.unbind(on_flip=on_first_frame)
+        result["time_to_first_frame"] = round(time.time() - process_started, 4)
+        Clock.schedule_once(lambda dt: app.stop(), 0)
+
+    app.build = timed_build
+    Window.bind(on_flip=on_first_frame)
+    app.run()
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def run_worker(args, env):
+    # Run this module as a worker in a fresh interpreter and return its JSON result
+    env = dict(os.environ, **BENCH_ENV, **env, BENCH_PROCESS_STARTED=str(time.time()))
+    completed = subprocess.run([sys.executable, '-m', 'tools.benchmark', '--worker'] + args, cwd=REPO_ROOT, env=env,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_suite(args):
+    from app.config.config import resorts
+    from tools.replay_server import ReplayServer, seed_synthetic
+
+    recordings_dir = tempfile.mkdtemp(prefix='bench-recordings-')
+    seed_synthetic(recordings_dir)
+    server = ReplayServer(('127.0.0.1', 0), recordings_dir, latency=args.latency / 1000, jitter=args.jitter / 1000).start()
+    upstream_env = {"RESORT_CONDITIONS_UPSTREAM": server.url}
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "version": subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip(),
+        "settings": {"latency_ms": args.latency, "jitter_ms": args.jitter, "micro_iterations": args.number},
+        "resorts": {},
+    }
+
+    for location in args.resort or list(resorts):
+        data_dir = tempfile.mkdtemp(prefix='bench-data-')
+        results["resorts"][location] = run_worker(['resort', location, server.url], dict(upstream_env, RESORT_CONDITIONS_DATA_DIR=data_dir))
+
+    results["micro"] = run_worker(['micro', server.url, str(args.number)], dict(upstream_env, RESORT_CONDITIONS_DATA_DIR=tempfile.mkdtemp(prefix='bench-data-')))
+
+    if not args.skip_startup:
+        startup_data_dir = tempfile.mkdtemp(prefix='bench-data-')
+        startup_env = dict(upstream_env, RESORT_CONDITIONS_DATA_DIR=startup_data_dir, KIVY_NO_ARGS='1')
+        results["startup"] = {
+            "cold": run_worker(['startup'], startup_env),  # Empty data directory, first launch
+            "warm": run_worker(['startup'], startup_env),  # Second launch with the first one's saved state
+        }
+
+    server.shutdown()
+    return results
+
+
+def flatten(results, prefix=''):
+    # {"a": {"b": 1.0}} -> {"a.b": 1.0}, numbers only
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(previous, current):
+    previous_flat = flatten({"resorts": previous.get("resorts", {}), "micro": previous.get("micro", {}), "startup": previous.get("startup", {})})
+    current_flat = flatten({"resorts": current.get("resorts", {}), "micro": current.get("micro", {}), "startup": current.get("startup", {})})
+    print(f"{'metric':70} {'previous':>12} {'current':>12} {'change':>8}")
+    for metric, value in current_flat.items():
+        if metric in previous_flat and previous_flat[metric]:
+            change = (value - previous_flat[metric]) / previous_flat[metric] * 100
+            print(f"{metric:70} {previous_flat[metric]:>12} {value:>12} {change:>+7.1f}%")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--worker']:
+        kind, worker_args = argv[1], argv[2:]
+        if kind == 'resort':
+            result = resort_worker(*worker_args)
+        elif kind == 'micro':
+            result = micro_worker(worker_args[0], int(worker_args[1]))
+        else:
+            result = startup_worker()
+        print(json.dumps(result))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark startup and data loading against the local replay server.")
+    parser.add_argument("--latency", type=float, default=100, help="Milliseconds of upstream latency to simulate")
+    parser.add_argument("--jitter", type=float, default=30, help="Random +/- milliseconds around --latency")
+    parser.add_argument("--resort", action="append", help="Only benchmark this resort (repeatable)")
+    parser.add_argument("--number", type=int, default=2000, help="Iterations per microbenchmark")
+    parser.add_argument("--skip-startup", action="store_true", help="Skip the GUI startup runs (no display available)")
+    parser.add_argument("--output", help="Results file (default: bench_results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args)
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{results['timestamp'].replace(':', '')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+# tools/replay_server.py
+# Local stand-in for every upstream the app talks to (Bing, AccuWeather, both RapidAPI hosts and
+# the UDOT roadcam images). Point the app at it with RESORT_CONDITIONS_UPSTREAM, which makes
+# app/utils/http_client.py send http://host/path to <server>/host/path:
+#
+#     python -m tools.replay_server --seed-synthetic            # fake data for every resort
+#     python -m tools.replay_server --mode record               # proxy upstream and save responses
+#     python -m tools.replay_server --latency 120 --jitter 80 --error-rate 0.05
+#     RESORT_CONDITIONS_UPSTREAM=http://127.0.0.1:8765 python main.py
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+from app.config.config import API_BASE_URLS, TWEET_FETCH_COUNT, resorts
+
+DEFAULT_RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), 'recordings')
+
+# Query parameters that don't identify a response: API keys, the user's own position, and the
+# tweet poll cursor (a replayed timeline is simply deduplicated by the tweet store)
+IGNORED_QUERY_PARAMS = {"apikey", "key", "wp.0", "origins", "since_id"}
+
+# Upstreams reached over HTTPS when recording
+HTTPS_HOSTS = {urlsplit(base_url).netloc for base_url in API_BASE_URLS.values() if base_url.startswith('https')}
+
+
+def recording_key(host, path, query):
+    params = sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True) if name not in IGNORED_QUERY_PARAMS)
+    return f"{host}{path}?{urlencode(params)}"
+
+
+class Recordings:
+    # Responses on disk: <dir>/<host>/<hash>.json (status, headers, request key) + <hash>.body
+    def __init__(self, recordings_dir):
+        self.recordings_dir = recordings_dir
+        self._by_key = {}
+        self._by_path = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.isdir(self.recordings_dir):
+            return
+        for host in os.listdir(self.recordings_dir):
+            host_dir = os.path.join(self.recordings_dir, host)
+            for name in os.listdir(host_dir):
+                if name.endswith('.json'):
+                    with open(os.path.join(host_dir, name)) as f:
+                        meta = json.load(f)
+                    with open(os.path.join(host_dir, name[:-5] + '.body'), 'rb') as f:
+                        self._index(meta, f.read())
+
+    def _index(self, meta, body):
+        entry = (meta["status"], meta["headers"], body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        self._by_key[meta["key"]] = entry
+        self._by_path.setdefault(meta["key"].split('?')[0], entry)
+
+    def find(self, host, path, query):
+        # Exact request first, then any recording for the same path
+        key = recording_key(host, path, query)
+        with self._lock:
+            return self._by_key.get(key) or self._by_path.get(key.split('?')[0])
+
+    def save(self, host, path, query, status, headers, body):
+        key = recording_key(host, path, query)
+        meta = {"key": key, "status": status, "headers": headers}
+        host_dir = os.path.join(self.recordings_dir, host)
+        os.makedirs(host_dir, exist_ok=True)
+        name = hashlib.sha1(key.encode()).hexdigest()[:16]
+        with open(os.path.join(host_dir, name + '.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        with open(os.path.join(host_dir, name + '.body'), 'wb') as f:
+            f.write(body)
+        with self._lock:
+            self._index(meta, body)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real upstreams
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        if parts.path == '/__stats':
+            # Counters for the benchmarks; not counted themselves
+            body = json.dumps({"requests": server.requests_served, "bytes": server.bytes_served}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        host, _, path = parts.path.lstrip('/').partition('/')
+        path = '/' + path
+
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if random.random() < server.error_rate:
+            self.send_body(503, {"Content-Type": "text/plain"}, b"Injected error")
+            return
+
+        recording = server.recordings.find(host, path, parts.query)
+        if recording is None and server.mode == 'record':
+            recording = self.record(host, path, parts.query)
+        if recording is None:
+            self.send_body(404, {"Content-Type": "text/plain"}, f"No recording for {host}{path}".encode())
+            return
+
+        status, headers, body, etag = recording
+        validators = self.headers.get('If-None-Match') or self.headers.get('If-Modified-Since')
+        if validators and self.headers.get('If-None-Match', etag) == etag and random.random() < server.not_modified_rate:
+            self.send_body(304, {"ETag": etag}, b"")
+            return
+        self.send_body(status, dict(headers, ETag=etag, **{"Last-Modified": server.last_modified}), body)
+
+    def record(self, host, path, query):
+        scheme = 'https' if host in HTTPS_HOSTS else 'http'
+        url = f"{scheme}://{host}{path}" + (f"?{query}" if query else "")
+        forwarded = {name: value for name, value in self.headers.items() if name.lower().startswith('x-rapidapi')}
+        try:
+            response = requests.get(url, headers=forwarded, timeout=30)
+        except requests.exceptions.RequestException as e:
+            print(f"Error recording {url}: {e}")
+            return None
+        headers = {"Content-Type": response.headers.get("Content-Type", "application/octet-stream")}
+        self.server.recordings.save(host, path, query, response.status_code, headers, response.content)
+        return self.server.recordings.find(host, path, query)
+
+    def send_body(self, status, headers, body):
+        self.server.count(len(body))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 8765), recordings_dir=DEFAULT_RECORDINGS_DIR, mode='replay',
+                 latency=0.0, jitter=0.0, error_rate=0.0, not_modified_rate=1.0, verbose=False):
+        super().__init__(address, ReplayHandler)
+        self.recordings = Recordings(recordings_dir)
+        self.mode = mode
+        self.latency = latency  # Seconds added to every response
+        self.jitter = jitter  # Up to this many seconds more or less
+        self.error_rate = error_rate  # Share of requests answered with a 503
+        self.not_modified_rate = not_modified_rate  # Share of matching conditional requests answered 304
+        self.verbose = verbose
+        self.last_modified = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime())
+        self.requests_served = 0
+        self.bytes_served = 0
+        self._counter_lock = threading.Lock()
+
+    def count(self, body_bytes):
+        with self._counter_lock:
+            self.requests_served += 1
+            self.bytes_served += body_bytes
+
+    def reset_counters(self):
+        with self._counter_lock:
+            self.requests_served = 0
+            self.bytes_served = 0
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        # Serve on a background thread (used by the benchmarks); returns the server
+        threading.Thread(target=self.serve_forever, name='replay-server', daemon=True).start()
+        return self
+
+
+def synthetic_image(ext, frames=1, size=(640, 480)):
+    from PIL import Image as PilImage
+
+    images = [PilImage.new('RGB', size, (40 + 30 * index, 90, 140)) for index in range(frames)]
+    output = BytesIO()
+    if ext == 'gif':
+        images[0].save(output, 'GIF', save_all=True, append_images=images[1:], duration=200, loop=0)
+    else:
+        images[0].save(output, 'JPEG', quality=80)
+    return output.getvalue()
+
+
+def seed_synthetic(recordings_dir=DEFAULT_RECORDINGS_DIR):
+    # Write plausible responses for every resort and camera in app/config/config.py
+    recordings = Recordings(recordings_dir)
+    json_headers = {"Content-Type": "application/json"}
+    now = datetime.now(timezone(timedelta(hours=-7)))
+
+    def save_json(base_url, path, params, payload):
+        host = urlsplit(base_url).netloc
+        recordings.save(host, path, urlencode(params), 200, json_headers, json.dumps(payload).encode())
+
+    for location, resort_data in resorts.items():
+        key = resort_data["accuweather_key"]
+        accuweather = API_BASE_URLS["accuweather"]
+        observation = lambda hours_ago: {
+            "LocalObservationDateTime": (now - timedelta(hours=hours_ago)).strftime('%Y-%m-%dT%H:00:00%z'),
+            "WeatherText": "Light snow",
+            "Temperature": {"Imperial": {"Value": 20 + hours_ago % 6}},
+            "RelativeHumidity": 80,
+            "Wind": {"Speed": {"Imperial": {"Value": 12}}},
+            "Visibility": {"Imperial": {"Value": 5}},
+        }
+        save_json(accuweather, f"/currentconditions/v1/{key}", {"details": True}, [observation(0)])
+        save_json(accuweather, f"/currentconditions/v1/{key}/historical/24", {"details": False, "metric": False},
+                  [observation(hours_ago) for hours_ago in range(24)])
+        save_json(accuweather, f"/currentconditions/v1/{key}/historical", {"details": False, "metric": False},
+                  [observation(hours_ago) for hours_ago in range(6)])
+        save_json(accuweather, f"/forecasts/v1/daily/1day/{key}", {"details": False}, {"DailyForecasts": [{
+            "Temperature": {"Minimum": {"Value": 12}, "Maximum": {"Value": 28}},
+            "Day": {"IconPhrase": "Snow"},
+        }]})
+        save_json(accuweather, f"/forecasts/v1/hourly/12hour/{key}", {"details": False}, [{
+            "DateTime": (now + timedelta(hours=hours)).strftime('%Y-%m-%dT%H:00:00%z'),
+            "Temperature": {"Value": 22 + hours % 4},
+            "IconPhrase": "Snow showers",
+        } for hours in range(1, 13)])
+        save_json(API_BASE_URLS["bing"], "/REST/V1/Routes/Driving",
+                  {"wp.1": resort_data["location"], "avoid": "minimizeTolls", "incidents": True},
+                  {"resourceSets": [{"resources": [{
+                      "travelDurationTraffic": 2700, "trafficCongestion": "mild", "trafficSeverity": "minor",
+                      "trafficIncidents": [{"type": "Construction", "description": "Lane closed near the canyon mouth",
+                                            "start": "07:00", "end": "17:00"}],
+                  }]}]})
+        if resort_data["resort_slug"]:
+            save_json(API_BASE_URLS["rapidapi_ski"], f"/v1/resort/{resort_data['resort_slug']}", {}, {"data": {
+                "lifts": {"status": {"Lift A": "open", "Lift B": "open", "Lift C": "closed"}},
+                "conditions": {"base": 140, "season": 620},
+            }})
+        save_json(API_BASE_URLS["rapidapi_twitter"], "/v1.1/UserTimeline/",
+                  {"username": resort_data["twitter_handle"], "count": str(TWEET_FETCH_COUNT)},
+                  [{"id_str": str(1700000000000000000 - index), "created_at": (now - timedelta(hours=index)).strftime('%a %b %d %H:%M:%S %z %Y'),
+                    "text": f"{location}: fresh snow overnight!" if index == 0 else f"{location}: lifts spinning, update {index}"}
+                   for index in range(3)])
+
+        for img_src_url in resort_data.get("roadcam_img_src_urls", []):
+            parts = urlsplit(img_src_url)
+            ext = 'gif' if parts.path.lower().endswith('.gif') else 'jpeg'
+            body = synthetic_image(ext, frames=6 if ext == 'gif' else 1)
+            recordings.save(parts.netloc, parts.path, parts.query, 200, {"Content-Type": f"image/{ext}"}, body)
+
+    save_json(API_BASE_URLS["bing"], "/REST/v1/Routes/DistanceMatrix", {
+        "destinations": ";".join(resort_data["coordinates"] for resort_data in resorts.values()),
+        "travelMode": "driving", "distanceUnit": "mi", "timeUnit": "minute",
+    }, {"resourceSets": [{"resources": [{"results": [
+        {"originIndex": 0, "destinationIndex": index, "travelDuration": 35.4 + 12 * index, "travelDistance": 24.8 + 9 * index}
+        for index in range(len(resorts))
+    ]}]}]})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record or replay upstream API responses locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS_DIR)
+    parser.add_argument("--mode", choices=["replay", "record"], default="replay")
+    parser.add_argument("--seed-synthetic", action="store_true", help="Write synthetic recordings for every resort first")
+    parser.add_argument("--latency", type=float, default=0, help="Milliseconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0, help="Random +/- milliseconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of requests answered with 503")
+    parser.add_argument("--not-modified-rate", type=float, default=1.0, help="Share of matching conditional GETs answered 304")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.seed_synthetic:
+        seed_synthetic(args.recordings)
+    server = ReplayServer((args.host, args.port), args.recordings, args.mode, args.latency / 1000, args.jitter / 1000,
+                          args.error_rate, args.not_modified_rate, args.verbose)
+    print(f"Serving {args.mode} on {server.url} (set RESORT_CONDITIONS_UPSTREAM={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# tools/startup_profile.py
+# Import-time breakdown of app startup: runs `python -X importtime -c "import main"` in a fresh
+# interpreter and sums each module's own import time by top-level package, slowest first:
+#
+#     python -m tools.startup_profile
+#     python -m tools.startup_profile --modules 30     # also list the 30 slowest single modules
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module='main'):
+    # [(module, self microseconds, cumulative microseconds)] as reported by -X importtime
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=REPO_ROOT, env=env,
+                               capture_output=True, text=True)
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def by_package(times):
+    totals = defaultdict(int)
+    for name, self_us, _ in times:
+        package = name.split('.')[0]
+        if package == 'app':
+            package = '.'.join(name.split('.')[:3])  # app.utils.api rather than just app
+        totals[package] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show where startup import time goes.")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--packages", type=int, default=20, help="Number of packages to list")
+    parser.add_argument("--modules", type=int, default=0, help="Also list this many of the slowest single modules")
+    args = parser.parse_args(argv)
+
+    times = import_times(args.module)
+    total_us = sum(self_us for _, self_us, _ in times)
+    print(f"import {args.module}: {total_us / 1000:.1f} ms across {len(times)} modules\n")
+    print(f"{'package':<40}{'ms':>9}{'share':>8}")
+    for package, self_us in by_package(times)[:args.packages]:
+        print(f"{package:<40}{self_us / 1000:>9.1f}{self_us / total_us:>8.0%}")
+
+    if args.modules:
+        print(f"\n{'module':<60}{'self ms':>9}{'cumulative ms':>15}")
+        for name, self_us, cumulative_us in sorted(times, key=lambda item: item[1], reverse=True)[:args.modules]:
+            print(f"{name:<60}{self_us / 1000:>9.1f}{cumulative_us / 1000:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()